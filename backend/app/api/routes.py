@@ -1,38 +1,82 @@
-from fastapi import APIRouter, HTTPException, Request
-from ..models.schemas import AnalysisRequest, AnalysisResponse, EnhancedResumeRequest, EnhancedResumeResponse
-from ..services.openai_service import analyze_resume, generate_enhanced_resume, generate_improvement_summary
-from ..services.pdf_service import generate_pdf_from_text
-from ..utils.response_parser import parse_ai_response
-from fastapi.responses import FileResponse
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi import APIRouter, HTTPException, Path, Request, Response
+from ..models.schemas import DOCUMENT_ID_PATTERN, AnalysisRequest, AnalysisResponse, BatchAnalysisRequest, BatchAnalysisResponse, EnhancedResumeRequest, EnhancedResumeResponse, EnhanceJobStatus, DocumentUploadRequest, DocumentResponse
+from ..services.openai_service import stream_analyze_resume, analysis_cache_identity
+from ..services.analysis_cache import analysis_cache, analysis_cache_key
+from ..services.analysis_service import get_analysis, is_cacheable_analysis, iter_batch_analyses
+from ..services.enhance_service import run_enhance_pipeline, stream_enhance_pipeline
+from ..services.job_queue import enhance_job_queue
+from ..services.artifact_store import artifact_store
+from ..services.document_store import document_store
+from ..services.rate_limiter import limiter, parse_rate
+from ..services.prompt_compaction import track_prompt_compaction, TOKENS_SAVED_HEADER
+from ..utils.response_parser import parse_ai_response, IncrementalAnalysisParser
+from fastapi.responses import FileResponse, StreamingResponse, JSONResponse
 import os
-from ..core.config import PDF_OUTPUT_DIR, BASE_BACKEND_URL
+import json
+import logging
+from ..core.config import BASE_BACKEND_URL, ANALYZE_BATCH_MAX_ITEMS, ANALYZE_BATCH_ITEM_RATE_LIMIT
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
+
+CACHE_BYPASS_HEADER = "X-Cache-Bypass"
+
+# A batch counts as one request against the endpoint limit plus one unit per
+# job description against this separate per-client item budget (and the LLM cost budget).
+batch_item_rate_limit = parse_rate(ANALYZE_BATCH_ITEM_RATE_LIMIT)
+
+def _cache_bypass_requested(request: Request) -> bool:
+    """Return True if the client asked to skip cached analyses."""
+    return request.headers.get(CACHE_BYPASS_HEADER, "").lower() in ("1", "true", "yes")
+
+async def _resolve_documents(request_data):
+    """Replace resume/job description IDs in a request with the stored texts."""
+    return request_data.model_copy(update={
+        "resume_text": await document_store.resolve(request_data.resume_text, request_data.resume_id, "resume"),
+        "job_description_text": await document_store.resolve(request_data.job_description_text, request_data.job_description_id, "job_description"),
+        "resume_id": None,
+        "job_description_id": None
+    })
+
+@router.post("/documents/", response_model=DocumentResponse)
+@limiter.limit("30/minute", scope="documents")
+async def upload_document(request: Request, request_data: DocumentUploadRequest):
+    """Store a resume or job description once and return its content-hash ID.
+
+    The ID can be passed as ``resume_id`` or ``job_description_id`` to the
+    analyze and enhance endpoints instead of the full text.
+    """
+    document_id, text = await document_store.put(request_data.text)
+    return DocumentResponse(document_id=document_id, characters=len(text))
+
+@router.get("/documents/{document_id}", response_model=DocumentResponse)
+async def get_document(document_id: str = Path(pattern=DOCUMENT_ID_PATTERN)):
+    """Return a stored document's normalized text."""
+    text = await document_store.get(document_id)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return DocumentResponse(document_id=document_id, characters=len(text), text=text)
 
 @router.post("/analyze/", response_model=AnalysisResponse)
-@limiter.limit("5/minute")
-async def analyze_resume_and_job_description(request: Request, request_data: AnalysisRequest):
+@limiter.limit("5/minute", scope="analyze")
+async def analyze_resume_and_job_description(request: Request, response: Response, request_data: AnalysisRequest):
     """Analyze resume against job description."""
-    print("=== Starting analyze_resume_and_job_description ===")
-    print(f"Request data received: {request_data}")
+    request_data = await _resolve_documents(request_data)
     
     if not request_data.resume_text or not request_data.job_description_text:
-        print("Error: Empty resume or job description")
         raise HTTPException(status_code=400, detail="Resume text and job description text cannot be empty.")
 
     try:
-        print("Calling analyze_resume function...")
-        # Get AI analysis
-        ai_response_text = analyze_resume(request_data.resume_text, request_data.job_description_text)
-        print("Successfully got response from analyze_resume")
-        
-        print("Parsing response...")
-        # Parse the response
-        parsed_response = parse_ai_response(ai_response_text)
-        print("Successfully parsed response")
+        with track_prompt_compaction() as compaction:
+            parsed_response, cache_hit = await get_analysis(
+                request_data.resume_text,
+                request_data.job_description_text,
+                bypass_cache=_cache_bypass_requested(request),
+                mode=request_data.mode
+            )
+        response.headers["X-Cache"] = "HIT" if cache_hit else "MISS"
+        response.headers[TOKENS_SAVED_HEADER] = str(compaction.tokens_saved)
 
         return AnalysisResponse(
             compatibility_score=parsed_response["compatibility_score"],
@@ -41,19 +85,151 @@ async def analyze_resume_and_job_description(request: Request, request_data: Ana
             missing_keywords=parsed_response["missing_keywords"]
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        print("=== ERROR OCCURRED ===")
-        print(f"Error type: {type(e)}")
-        print(f"Error message: {str(e)}")
-        print("Full traceback:")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Unexpected error during analysis")
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred during analysis: {str(e)}")
 
+def _ndjson_event(event: str, data) -> str:
+    """Serialize one streamed event as a newline-delimited JSON line."""
+    return json.dumps({"event": event, "data": data}) + "\n"
+
+async def _stream_analysis_events(resume_text: str, job_description_text: str, cache_key: str, bypass_cache: bool):
+    """Yield analysis events as NDJSON, from the cache or from a streaming completion."""
+    parsed_response = None if bypass_cache else await analysis_cache.get(cache_key)
+    if parsed_response is not None:
+        yield _ndjson_event("score", parsed_response["compatibility_score"])
+        for line in parsed_response["improvement_summary"].split("\n"):
+            item = line.strip().lstrip("- ").strip()
+            if item:
+                yield _ndjson_event("summary_item", item)
+        for keyword in parsed_response["matched_keywords"]:
+            yield _ndjson_event("matched_keyword", keyword)
+        for keyword in parsed_response["missing_keywords"]:
+            yield _ndjson_event("missing_keyword", keyword)
+        yield _ndjson_event("result", parsed_response)
+        return
+
+    parser = IncrementalAnalysisParser()
+    try:
+        async for chunk in stream_analyze_resume(resume_text, job_description_text):
+            for event, data in parser.feed(chunk):
+                yield _ndjson_event(event, data)
+        for event, data in parser.finish():
+            yield _ndjson_event(event, data)
+    except HTTPException as e:
+        yield _ndjson_event("error", e.detail)
+        return
+
+    # Emit the same final shape as the non-streaming endpoint
+    parsed_response = parse_ai_response(parser.text)
+    if is_cacheable_analysis(parsed_response):
+        await analysis_cache.set(cache_key, parsed_response)
+    yield _ndjson_event("result", AnalysisResponse(**parsed_response).model_dump())
+
+@router.post("/analyze/stream/")
+@limiter.limit("5/minute", scope="analyze_stream")
+async def analyze_resume_stream(request: Request, request_data: AnalysisRequest):
+    """Analyze resume against job description, streaming results as newline-delimited JSON.
+
+    Each line is an object with ``event`` and ``data``. Events are ``score``,
+    ``summary_item``, ``matched_keyword`` and ``missing_keyword`` as soon as each
+    completes, then a final ``result`` with the full analysis (or ``error``).
+    """
+    request_data = await _resolve_documents(request_data)
+    if not request_data.resume_text or not request_data.job_description_text:
+        raise HTTPException(status_code=400, detail="Resume text and job description text cannot be empty.")
+    if request_data.mode != "llm":
+        raise HTTPException(status_code=400, detail="Streaming analysis only supports mode 'llm'.")
+
+    # Streaming always uses the line-based text format
+    cache_key = analysis_cache_key(
+        request_data.resume_text,
+        request_data.job_description_text,
+        *analysis_cache_identity("text")
+    )
+    return StreamingResponse(
+        _stream_analysis_events(
+            request_data.resume_text,
+            request_data.job_description_text,
+            cache_key,
+            _cache_bypass_requested(request)
+        ),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _validate_batch_request(request: Request, request_data: BatchAnalysisRequest):
+    """Check batch size and charge the batch against the per-client item budget."""
+    if not request_data.resume_text:
+        raise HTTPException(status_code=400, detail="Resume text cannot be empty.")
+    if not request_data.job_description_texts:
+        raise HTTPException(status_code=400, detail="At least one job description is required.")
+    if len(request_data.job_description_texts) > ANALYZE_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"A batch can contain at most {ANALYZE_BATCH_MAX_ITEMS} job descriptions.")
+    await limiter.hit(request, "analyze_batch_item", batch_item_rate_limit, units=len(request_data.job_description_texts))
+
+@router.post("/analyze/batch/", response_model=BatchAnalysisResponse)
+@limiter.limit("5/minute", scope="analyze_batch")
+async def analyze_resume_batch(request: Request, response: Response, request_data: BatchAnalysisRequest):
+    """Analyze one resume against several job descriptions.
+
+    Results are returned in request order. Each item carries either a result
+    or an error, so one failed job description does not fail the batch.
+    """
+    await _validate_batch_request(request, request_data)
+
+    with track_prompt_compaction() as compaction:
+        results = [
+            item async for item in iter_batch_analyses(
+                request_data.resume_text,
+                request_data.job_description_texts,
+                bypass_cache=_cache_bypass_requested(request),
+                mode=request_data.mode
+            )
+        ]
+    response.headers[TOKENS_SAVED_HEADER] = str(compaction.tokens_saved)
+    results.sort(key=lambda item: item.index)
+    failed = sum(1 for item in results if item.error is not None)
+    return BatchAnalysisResponse(results=results, succeeded=len(results) - failed, failed=failed)
+
+async def _stream_batch_items(resume_text: str, job_description_texts: list, bypass_cache: bool, mode: str):
+    async for item in iter_batch_analyses(resume_text, job_description_texts, bypass_cache=bypass_cache, mode=mode):
+        yield item.model_dump_json() + "\n"
+
+@router.post("/analyze/batch/stream/")
+@limiter.limit("5/minute", scope="analyze_batch_stream")
+async def analyze_resume_batch_stream(request: Request, request_data: BatchAnalysisRequest):
+    """Analyze one resume against several job descriptions, streaming each item as NDJSON when it finishes."""
+    await _validate_batch_request(request, request_data)
+
+    return StreamingResponse(
+        _stream_batch_items(
+            request_data.resume_text,
+            request_data.job_description_texts,
+            _cache_bypass_requested(request),
+            request_data.mode
+        ),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/cache-stats/")
+async def cache_stats():
+    """Return analysis cache counters."""
+    return analysis_cache.stats()
+
+@router.get("/artifact-stats/")
+async def artifact_stats():
+    """Return generated PDF storage occupancy."""
+    return artifact_store.stats()
+
 @router.post("/enhance-resume/", response_model=EnhancedResumeResponse)
-@limiter.limit("5/minute")
-async def enhance_resume(request: Request, request_data: EnhancedResumeRequest):
+@limiter.limit("5/minute", scope="enhance")
+async def enhance_resume(request: Request, response: Response, request_data: EnhancedResumeRequest):
     """Generate an enhanced resume in PDF format based on the job description."""
+    request_data = await _resolve_documents(request_data)
     if not request_data.job_description_text:
         raise HTTPException(status_code=400, detail="Job description text cannot be empty.")
     
@@ -61,55 +237,94 @@ async def enhance_resume(request: Request, request_data: EnhancedResumeRequest):
         raise HTTPException(status_code=400, detail="Resume text cannot be empty.")
     
     try:
-        # Enhance the resume based on job description and improvement suggestions
-        enhanced_resume_text = generate_enhanced_resume(
-            request_data.resume_text, 
-            request_data.job_description_text,
-            request_data.improvement_suggestions
-        )
-        
-        # Generate improvement summary
-        improvement_summary = generate_improvement_summary(
-            request_data.resume_text,
-            enhanced_resume_text,
-            request_data.job_description_text
-        )
-        
-        # Generate PDF from enhanced resume text
-        pdf_filename = generate_pdf_from_text(
-            enhanced_resume_text,
-            request_data.applicant_name,
-            request_data.contact_info,
-            request_data.github_link,
-            request_data.linkedin_link,
-            request_data.portfolio_link
-        )
-        
-        # Create a fully qualified URL for the PDF
-        pdf_url = f"{BASE_BACKEND_URL}/download-pdf/{pdf_filename}"
-        print(f"Generated PDF URL: {pdf_url}")
-        
-        return EnhancedResumeResponse(
-            pdf_url=pdf_url,
-            improvement_summary=improvement_summary
+        with track_prompt_compaction() as compaction:
+            result = await run_enhance_pipeline(request_data)
+        response.headers["Server-Timing"] = ", ".join(
+            f"{stage};dur={seconds * 1000:.0f}" for stage, seconds in result.stage_timings.items()
         )
+        response.headers[TOKENS_SAVED_HEADER] = str(compaction.tokens_saved)
+        return result
     
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Unexpected error during resume enhancement")
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred during resume enhancement: {str(e)}")
 
+async def _stream_enhance_events(request_data: EnhancedResumeRequest):
+    """Yield enhance pipeline events as NDJSON, ending with ``result`` or ``error``."""
+    try:
+        async for event, data in stream_enhance_pipeline(request_data):
+            yield _ndjson_event(event, data)
+    except HTTPException as e:
+        yield _ndjson_event("error", e.detail)
+    except Exception as e:
+        logger.exception("Unexpected error during streamed resume enhancement")
+        yield _ndjson_event("error", f"An unexpected error occurred during resume enhancement: {str(e)}")
+
+@router.post("/enhance-resume/stream/")
+@limiter.limit("5/minute", scope="enhance_stream")
+async def enhance_resume_stream(request: Request, request_data: EnhancedResumeRequest):
+    """Generate an enhanced resume, streaming its text and a live HTML preview as newline-delimited JSON.
+
+    Each line is an object with ``event`` and ``data``. ``token`` events carry
+    the enhanced text as it is generated. A ``section`` event with ``name`` and
+    ``html`` follows each completed resume section; ``html`` is the full
+    preview in the chosen layout, rendered from every section completed so far.
+    A final ``result`` has the same fields as /enhance-resume/ (or ``error``).
+    """
+    request_data = await _resolve_documents(request_data)
+    if not request_data.job_description_text:
+        raise HTTPException(status_code=400, detail="Job description text cannot be empty.")
+
+    if not request_data.resume_text:
+        raise HTTPException(status_code=400, detail="Resume text cannot be empty.")
+
+    return StreamingResponse(
+        _stream_enhance_events(request_data),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _job_status(status: dict) -> EnhanceJobStatus:
+    return EnhanceJobStatus(status_url=f"{BASE_BACKEND_URL}/enhance-resume/jobs/{status['job_id']}", **status)
+
+@router.post("/enhance-resume/jobs/", response_model=EnhanceJobStatus, status_code=202)
+@limiter.limit("5/minute", scope="enhance_job")
+async def submit_enhance_job(request: Request, request_data: EnhancedResumeRequest):
+    """Queue a resume enhancement and return a job whose status can be polled."""
+    request_data = await _resolve_documents(request_data)
+    if not request_data.job_description_text:
+        raise HTTPException(status_code=400, detail="Job description text cannot be empty.")
+    
+    if not request_data.resume_text:
+        raise HTTPException(status_code=400, detail="Resume text cannot be empty.")
+
+    job = await enhance_job_queue.submit(request_data)
+    status = _job_status(job.status())
+    return JSONResponse(status_code=202, content=status.model_dump(), headers={"Location": status.status_url})
+
+@router.get("/enhance-resume/jobs/{job_id}", response_model=EnhanceJobStatus)
+async def get_enhance_job(job_id: str):
+    """Report the current stage of a queued resume enhancement and its result when done."""
+    status = await enhance_job_queue.get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return _job_status(status)
+
 @router.get("/download-pdf/{filename}")
-@limiter.limit("5/minute")
+@limiter.limit("5/minute", scope="download")
 async def download_pdf(request: Request, filename: str):
     """Download a generated PDF file."""
-    filepath = os.path.join(PDF_OUTPUT_DIR, filename)
-    if not os.path.exists(filepath):
+    if os.path.basename(filename) != filename or not filename.endswith(".pdf"):
+        raise HTTPException(status_code=404, detail="PDF file not found")
+    if not artifact_store.touch(filename):
+        if artifact_store.was_evicted(filename):
+            raise HTTPException(status_code=410, detail="PDF file has expired. Please generate it again.")
         raise HTTPException(status_code=404, detail="PDF file not found")
     
     return FileResponse(
-        filepath, 
+        artifact_store.path_for(filename), 
         media_type="application/pdf",
         headers={
             "Content-Disposition": f"attachment; filename={filename}",
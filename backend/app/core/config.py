@@ -1,14 +1,161 @@
 import os
-from dotenv import load_dotenv
+import json
 import tempfile
 
-# Load environment variables from .env file
-load_dotenv()
+# Settings are read from the environment. A .env file is loaded by the app
+# entrypoint (app/main.py), not here, so importing config has no side effects.
 
 # API Keys
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 DOCRAPTOR_API_KEY = os.getenv("DOCRAPTOR_API_KEY")
 
+# OpenAI client settings
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "120"))
+OPENAI_CONNECT_TIMEOUT_SECONDS = float(os.getenv("OPENAI_CONNECT_TIMEOUT_SECONDS", "10"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "32"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+# Concurrent identical chat completions share one upstream call
+LLM_SINGLE_FLIGHT_ENABLED = os.getenv("LLM_SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+# Local keyword matcher taxonomy (canonical skill -> synonyms)
+SKILLS_TAXONOMY_PATH = os.getenv(
+    "SKILLS_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "skills_taxonomy.yaml")
+)
+
+# Batch analysis settings
+ANALYZE_BATCH_MAX_ITEMS = int(os.getenv("ANALYZE_BATCH_MAX_ITEMS", "50"))
+ANALYZE_BATCH_CONCURRENCY = int(os.getenv("ANALYZE_BATCH_CONCURRENCY", "5"))
+ANALYZE_BATCH_ITEM_RATE_LIMIT = os.getenv("ANALYZE_BATCH_ITEM_RATE_LIMIT", "100/minute")
+
+# Rate limiting: token buckets in storage shared by every worker and instance.
+# "sqlite:///path" for one host, "redis://host:port/db" (any Redis-compatible
+# server) for several, "memory://" for a single process.
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_STORAGE_URI = os.getenv(
+    "RATE_LIMIT_STORAGE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "resume_analyzer_rate_limits.db")
+)
+# Per-client budget of LLM cost units, on top of each endpoint's own request limit
+RATE_LIMIT_COST_BUDGET = os.getenv("RATE_LIMIT_COST_BUDGET", "60/minute")
+# Cost units charged per request (per item for analyze_batch_item), roughly LLM calls made
+RATE_LIMIT_COSTS = {
+    "analyze": 1.0,
+    "analyze_stream": 1.0,
+    "analyze_batch_item": 1.0,
+    "enhance": 3.0,
+    "enhance_stream": 3.0,
+    "enhance_job": 3.0,
+    **json.loads(os.getenv("RATE_LIMIT_COSTS", "{}")),
+}
+# Budgets for clients sending X-API-Key, as a JSON object of key -> rate, e.g. {"k1": "600/minute"}
+RATE_LIMIT_API_KEYS = json.loads(os.getenv("RATE_LIMIT_API_KEYS", "{}"))
+
+# DocRaptor client settings
+DOCRAPTOR_URL = os.getenv("DOCRAPTOR_URL", "https://api.docraptor.com/docs")
+DOCRAPTOR_CONNECT_TIMEOUT_SECONDS = float(os.getenv("DOCRAPTOR_CONNECT_TIMEOUT_SECONDS", "10"))
+DOCRAPTOR_READ_TIMEOUT_SECONDS = float(os.getenv("DOCRAPTOR_READ_TIMEOUT_SECONDS", "60"))
+DOCRAPTOR_MAX_CONNECTIONS = int(os.getenv("DOCRAPTOR_MAX_CONNECTIONS", "20"))
+DOCRAPTOR_MAX_RETRIES = int(os.getenv("DOCRAPTOR_MAX_RETRIES", "3"))
+DOCRAPTOR_BACKOFF_BASE_SECONDS = float(os.getenv("DOCRAPTOR_BACKOFF_BASE_SECONDS", "0.5"))
+
+# Upstream resilience. Each request gets REQUEST_BUDGET_SECONDS (clients may ask
+# for less with an X-Request-Timeout header) and upstream calls are cut off with
+# a 504 once it runs out. After CIRCUIT_FAILURE_THRESHOLD consecutive failures an
+# upstream's circuit opens and calls fail fast with 503 for CIRCUIT_RESET_SECONDS.
+# Hedging sends a second identical request once the first has outlived the
+# HEDGE_PERCENTILE latency of recent calls; it trades upstream spend for tail latency.
+REQUEST_BUDGET_SECONDS = float(os.getenv("REQUEST_BUDGET_SECONDS", "180"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+DOCRAPTOR_HEDGE_ENABLED = os.getenv("DOCRAPTOR_HEDGE_ENABLED", "false").lower() == "true"
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+
+# Analysis output format: "text" (line-based, parsed by parse_ai_response) or
+# "json" (schema-constrained structured output from ANALYSIS_JSON_MODEL)
+ANALYSIS_OUTPUT_FORMAT = os.getenv("ANALYSIS_OUTPUT_FORMAT", "text").lower()
+ANALYSIS_JSON_MODEL = os.getenv("ANALYSIS_JSON_MODEL", "gpt-4o")
+
+# Model routing per LLM stage. Each stage calls its primary model; when that
+# call misses latency_budget_seconds or fails transiently, the stage is retried
+# on the faster fallback model (null for none). max_tokens caps the output.
+# MODEL_ROUTES overrides fields as JSON, e.g. {"summary": {"primary": "gpt-4o"}}
+# The max_tokens defaults are the caps these calls always had, so outputs are
+# never cut shorter than before. A budget is meant to catch only the slow tail:
+# it should sit above the stage's p99 in resume_analyzer_llm_call_duration_seconds
+# and be tuned from it. Until measured they assume a slow ~35 tokens/s on the
+# primary: enhance fits a full 4000-token rewrite (~115 s, within
+# OPENAI_TIMEOUT_SECONDS), analyze ~3000 tokens, far more than an analysis
+# uses. The fallback gets the rest of REQUEST_BUDGET_SECONDS.
+_MODEL_ROUTE_DEFAULTS = {
+    "analyze": {"primary": "gpt-4", "fallback": "gpt-4o-mini", "latency_budget_seconds": 90.0, "max_tokens": 4095},
+    "analyze_json": {"primary": ANALYSIS_JSON_MODEL, "fallback": "gpt-4o-mini", "latency_budget_seconds": 60.0, "max_tokens": 4095},
+    "enhance": {"primary": "gpt-4", "fallback": "gpt-4o-mini", "latency_budget_seconds": 120.0, "max_tokens": 4000},
+    "summary": {"primary": "gpt-4o-mini", "fallback": "gpt-3.5-turbo", "latency_budget_seconds": 30.0, "max_tokens": 1500},
+}
+_MODEL_ROUTE_OVERRIDES = json.loads(os.getenv("MODEL_ROUTES", "{}"))
+MODEL_ROUTES = {
+    stage: {**route, **_MODEL_ROUTE_OVERRIDES.get(stage, {})}
+    for stage, route in _MODEL_ROUTE_DEFAULTS.items()
+}
+
+# Prompt input compaction: whitespace, boilerplate and duplicate removal, then
+# section-aware trimming of job descriptions to their token budget. Resumes are
+# trimmed only for analysis, and only when the whole prompt would not otherwise
+# fit the context window of every model the stage can be routed to.
+PROMPT_COMPACTION_ENABLED = os.getenv("PROMPT_COMPACTION_ENABLED", "true").lower() == "true"
+PROMPT_JOB_DESCRIPTION_MAX_TOKENS = int(os.getenv("PROMPT_JOB_DESCRIPTION_MAX_TOKENS", "1000"))
+# Context window in tokens per model (prompt plus completion); MODEL_CONTEXT_WINDOWS
+# adds or overrides models as JSON. Unlisted models get DEFAULT_MODEL_CONTEXT_WINDOW.
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4": 8192,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-3.5-turbo": 16385,
+    **json.loads(os.getenv("MODEL_CONTEXT_WINDOWS", "{}")),
+}
+DEFAULT_MODEL_CONTEXT_WINDOW = int(os.getenv("DEFAULT_MODEL_CONTEXT_WINDOW", "8192"))
+
+# Analysis cache settings
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "1024"))
+ANALYSIS_CACHE_TTL_SECONDS = float(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "86400"))
+ANALYSIS_CACHE_DIR = os.getenv("ANALYSIS_CACHE_DIR", "")  # Empty disables the disk tier
+ANALYSIS_CACHE_MAX_DISK_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_DISK_ENTRIES", "10000"))
+
+# Uploaded document settings (resumes and job descriptions referenced by content ID).
+# IDs handed out by one worker must resolve on every other, so documents are
+# kept on disk by default; instances on different hosts need DOCUMENT_STORE_DIR
+# on a shared volume. The in-memory tier holds at most
+# DOCUMENT_STORE_MAX_ENTRIES x DOCUMENT_MAX_CHARS characters per worker (50 MB by default).
+DOCUMENT_MAX_CHARS = int(os.getenv("DOCUMENT_MAX_CHARS", "50000"))
+DOCUMENT_STORE_MAX_ENTRIES = int(os.getenv("DOCUMENT_STORE_MAX_ENTRIES", "1000"))
+DOCUMENT_STORE_TTL_SECONDS = float(os.getenv("DOCUMENT_STORE_TTL_SECONDS", "86400"))
+DOCUMENT_STORE_DIR = os.getenv("DOCUMENT_STORE_DIR", os.path.join(tempfile.gettempdir(), "resume_documents"))  # Empty keeps documents in one worker's memory only
+DOCUMENT_STORE_MAX_DISK_ENTRIES = int(os.getenv("DOCUMENT_STORE_MAX_DISK_ENTRIES", "20000"))
+
+# Logging: JSON lines (or "text" for local development) written by a background
+# thread. Hot-path lines are kept for LOG_SAMPLE_RATE of requests; warnings and
+# errors always are. Fields named in LOG_REDACT_FIELDS are logged by size only.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))
+LOG_MAX_MESSAGE_CHARS = int(os.getenv("LOG_MAX_MESSAGE_CHARS", "2000"))
+LOG_REDACT_FIELDS = frozenset(
+    os.getenv(
+        "LOG_REDACT_FIELDS",
+        "resume_text,job_description_text,enhanced_resume_text,text,request_data,prompt,completion"
+    ).split(",")
+)
+
+# Prometheus metrics: exposed on /metrics when enabled. With several worker
+# processes also set PROMETHEUS_MULTIPROC_DIR so the endpoint aggregates them.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
 # Base URL for backend
 BASE_BACKEND_URL = os.getenv("BASE_BACKEND_URL", "http://localhost:8000")
 
@@ -25,9 +172,43 @@ CORS_ORIGINS = [
     "https://*.storage.googleapis.com"  # Allow all subdomains
 ]
 
-# PDF Settings
-PDF_OUTPUT_DIR = os.path.join(tempfile.gettempdir(), "resume_pdfs")
-os.makedirs(PDF_OUTPUT_DIR, exist_ok=True)
+# PDF Settings. The size quota covers the whole output directory, re-read by
+# each worker every PDF_SWEEP_INTERVAL_SECONDS, so with several workers it can
+# be exceeded between sweeps.
+PDF_OUTPUT_DIR = os.getenv("PDF_OUTPUT_DIR", os.path.join(tempfile.gettempdir(), "resume_pdfs"))
+PDF_MAX_AGE_SECONDS = float(os.getenv("PDF_MAX_AGE_SECONDS", "86400"))
+PDF_MAX_TOTAL_BYTES = int(os.getenv("PDF_MAX_TOTAL_BYTES", str(512 * 1024 * 1024)))
+PDF_SWEEP_INTERVAL_SECONDS = float(os.getenv("PDF_SWEEP_INTERVAL_SECONDS", "300"))
+
+# PDF rendering backend: "docraptor" (remote API) or "weasyprint" (local process pool)
+PDF_RENDER_BACKEND = os.getenv("PDF_RENDER_BACKEND", "docraptor").lower()
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+PDF_RENDER_MAX_QUEUE = int(os.getenv("PDF_RENDER_MAX_QUEUE", "8"))
+PDF_RENDER_FALLBACK_TO_DOCRAPTOR = os.getenv("PDF_RENDER_FALLBACK_TO_DOCRAPTOR", "true").lower() == "true"
+
+# Resume HTML templates: one Jinja2 layout and stylesheet per entry in RESUME_LAYOUTS
+RESUME_TEMPLATES_DIR = os.getenv(
+    "RESUME_TEMPLATES_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+)
+RESUME_DEFAULT_LAYOUT = os.getenv("RESUME_DEFAULT_LAYOUT", "modern")
+
+# Startup warm-up: pre-open pooled connections to OpenAI and DocRaptor in the
+# lifespan so the first requests skip the TCP/TLS handshake. Failures only log.
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "false").lower() == "true"
+STARTUP_WARMUP_TIMEOUT_SECONDS = float(os.getenv("STARTUP_WARMUP_TIMEOUT_SECONDS", "5"))
+
+# Background enhance job settings. Job status is kept in storage shared by
+# every worker, so a job can be polled on any of them: "sqlite:///path" for
+# one host, "redis://host:port/db" for several, "memory://" for a single process.
+ENHANCE_JOB_STORAGE_URI = os.getenv(
+    "ENHANCE_JOB_STORAGE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "resume_analyzer_jobs.db")
+)
+ENHANCE_JOB_WORKERS = int(os.getenv("ENHANCE_JOB_WORKERS", "4"))
+ENHANCE_JOB_MAX_QUEUE = int(os.getenv("ENHANCE_JOB_MAX_QUEUE", "100"))
+ENHANCE_JOB_TTL_SECONDS = float(os.getenv("ENHANCE_JOB_TTL_SECONDS", "3600"))
+ENHANCE_JOB_BUDGET_SECONDS = float(os.getenv("ENHANCE_JOB_BUDGET_SECONDS", "300"))
 
 # API Settings
 API_TITLE = "Resume Analyzer API"
@@ -0,0 +1,234 @@
+# app/core/logging_config.py
+import json
+import logging
+import queue
+import re
+import sys
+import time
+import uuid
+import zlib
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from .config import (
+    LOG_LEVEL,
+    LOG_FORMAT,
+    LOG_QUEUE_SIZE,
+    LOG_SAMPLE_RATE,
+    LOG_MAX_MESSAGE_CHARS,
+    LOG_REDACT_FIELDS,
+)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Loggers under this name are configured; every app module logs to logging.getLogger(__name__)
+APP_LOGGER = "app"
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else came from ``extra=`` and is logged as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "sampled", "request_id"}
+
+# Contact details that end up in messages through exception text and the like
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE = re.compile(r"(?<!\d)(?:\+?\d[\s().-]?){9,14}\d(?!\d)")
+_REQUEST_ID_PATTERN = re.compile(r"^[\w.-]{1,64}$")
+
+
+def get_request_id() -> Optional[str]:
+    """The ID of the request being handled, if any."""
+    return _request_id.get()
+
+
+def set_request_id(request_id: Optional[str]):
+    """Attribute logs from the current task (and tasks it starts) to a request ID."""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token):
+    """Restore the request ID that was current before ``set_request_id`` returned ``token``."""
+    _request_id.reset(token)
+
+
+def redact(value) -> str:
+    """Describe a sensitive value by its size only."""
+    return f"[redacted {len(value) if isinstance(value, str) else type(value).__name__}]"
+
+
+def _scrub(text: str) -> str:
+    text = _PHONE.sub("[phone]", _EMAIL.sub("[email]", text))
+    if len(text) > LOG_MAX_MESSAGE_CHARS:
+        text = f"{text[:LOG_MAX_MESSAGE_CHARS]}... [{len(text) - LOG_MAX_MESSAGE_CHARS} more chars]"
+    return text
+
+
+def _fields(record: logging.LogRecord) -> dict:
+    """``extra=`` fields of a record, with resume and job description bodies redacted."""
+    return {
+        key: redact(value) if key in LOG_REDACT_FIELDS else value
+        for key, value in vars(record).items()
+        if key not in _RECORD_ATTRIBUTES and not key.startswith("_")
+    }
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the request ID and any ``extra=`` fields."""
+
+    converter = time.gmtime
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": _scrub(record.getMessage()),
+        }
+        if record.request_id:
+            entry["request_id"] = record.request_id
+        entry.update(_fields(record))
+        if record.exc_info:
+            entry["exception"] = _scrub(self.formatException(record.exc_info))
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development, redacted like the JSON output."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"{self.formatTime(record)} {record.levelname:<7} {record.name}"
+        if record.request_id:
+            line += f" [{record.request_id}]"
+        line += f" {_scrub(record.getMessage())}"
+        fields = _fields(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + _scrub(self.formatException(record.exc_info))
+        return line
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the request ID and apply hot-path sampling.
+
+    Records logged with ``extra={"sampled": True}`` below WARNING are kept for
+    LOG_SAMPLE_RATE of requests. The decision hashes the request ID, so a
+    sampled request keeps all of its hot-path lines and others keep none.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id = _request_id.get()
+        record.request_id = request_id
+        if getattr(record, "sampled", False) and record.levelno < logging.WARNING and LOG_SAMPLE_RATE < 1.0:
+            key = request_id or f"{record.created}"
+            return zlib.crc32(key.encode("utf-8")) / 0xFFFFFFFF < LOG_SAMPLE_RATE
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Hand records to the listener thread without blocking the event loop.
+
+    Message arguments are merged in the calling thread, but exceptions are
+    formatted by the listener. When the queue is full records are dropped and
+    counted rather than waited on.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+
+
+def setup_logging():
+    """Route app logs through a bounded queue to a background writer thread."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _queue_handler = DroppingQueueHandler(log_queue)
+    _queue_handler.addFilter(RequestContextFilter())
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    app_logger = logging.getLogger(APP_LOGGER)
+    app_logger.handlers = [_queue_handler]
+    app_logger.setLevel(LOG_LEVEL)
+    app_logger.propagate = False
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    if _queue_handler.dropped:
+        logging.getLogger(__name__).warning("Dropped log records because the log queue was full", extra={"dropped": _queue_handler.dropped})
+    _listener.stop()
+    logging.getLogger(APP_LOGGER).handlers = []
+    _listener = None
+    _queue_handler = None
+
+
+class RequestIdMiddleware:
+    """ASGI middleware that assigns each request an ID and logs one access line.
+
+    A well-formed incoming X-Request-ID is reused so IDs can be correlated
+    across services; otherwise a new one is generated. The ID is echoed in
+    the response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.logger = logging.getLogger("app.access")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(REQUEST_ID_HEADER.lower().encode("latin-1"), b"").decode("latin-1")
+        request_id = incoming if _REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex
+        token = set_request_id(request_id)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (REQUEST_ID_HEADER.lower().encode("latin-1"), request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            self.logger.info(
+                "%s %s %s", scope["method"], scope["path"], status_code,
+                extra={
+                    "sampled": status_code < 500,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                }
+            )
+            reset_request_id(token)
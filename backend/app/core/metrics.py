@@ -0,0 +1,152 @@
+# app/core/metrics.py
+import functools
+import inspect
+import os
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+
+# Set by the process manager when several workers serve the app; each worker
+# then writes its samples to files there and /metrics aggregates them
+_MULTIPROCESS_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+STAGE_LATENCY = Histogram(
+    "resume_analyzer_stage_duration_seconds",
+    "Time spent in each pipeline stage, including failed calls.",
+    ["stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+STAGE_ERRORS = Counter(
+    "resume_analyzer_stage_errors_total",
+    "Pipeline stage calls that failed, by exception type.",
+    ["stage", "error"],
+)
+STAGE_IN_FLIGHT = Gauge(
+    "resume_analyzer_stage_in_flight",
+    "Pipeline stage calls currently running.",
+    ["stage"],
+    multiprocess_mode="livesum",
+)
+LLM_TOKENS = Counter(
+    "resume_analyzer_llm_tokens_total",
+    "Tokens reported by OpenAI responses.",
+    ["model", "kind"],
+)
+LLM_CALL_LATENCY = Histogram(
+    "resume_analyzer_llm_call_duration_seconds",
+    "Latency of routed chat completions by stage, model and outcome (ok, timeout, deadline, error).",
+    ["stage", "model", "outcome"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 45, 60, 90, 120, 180),
+)
+LLM_FALLBACKS = Counter(
+    "resume_analyzer_llm_fallbacks_total",
+    "Stage calls retried on the fallback model, by reason (timeout, error, circuit_open).",
+    ["stage", "reason"],
+)
+LLM_COALESCED_CALLS = Counter(
+    "resume_analyzer_llm_coalesced_calls_total",
+    "Chat completions served by joining an identical call already in flight.",
+    ["model"],
+)
+CIRCUIT_STATE = Gauge(
+    "resume_analyzer_circuit_state",
+    "Upstream circuit breaker state: 0 closed, 1 half-open, 2 open.",
+    ["upstream"],
+    multiprocess_mode="max",
+)
+CIRCUIT_REJECTIONS = Counter(
+    "resume_analyzer_circuit_rejections_total",
+    "Upstream calls failed fast with 503 because the circuit was open.",
+    ["upstream"],
+)
+HEDGED_CALLS = Counter(
+    "resume_analyzer_hedged_calls_total",
+    "Upstream calls that sent a hedge request, by which request answered first.",
+    ["upstream", "winner"],
+)
+UPSTREAM_DEADLINE_EXCEEDED = Counter(
+    "resume_analyzer_upstream_deadline_exceeded_total",
+    "Upstream calls skipped or cut off because the request's time budget ran out.",
+    ["upstream"],
+)
+PDF_BYTES = Histogram(
+    "resume_analyzer_pdf_bytes",
+    "Size of rendered PDFs.",
+    ["backend"],
+    buckets=(10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000),
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "resume_analyzer_rate_limit_rejections_total",
+    "Requests rejected with 429 by the rate limiter.",
+    ["scope"],
+)
+
+
+def record_stage_error(stage: str, error: BaseException):
+    """Count a failure that a stage handled itself instead of raising."""
+    STAGE_ERRORS.labels(stage, type(error).__name__).inc()
+
+
+def record_llm_usage(model: str, usage):
+    """Add the prompt and completion token counts of one OpenAI response."""
+    if usage is None:
+        return
+    LLM_TOKENS.labels(model, "prompt").inc(usage.prompt_tokens or 0)
+    LLM_TOKENS.labels(model, "completion").inc(usage.completion_tokens or 0)
+
+
+def instrument(stage: str):
+    """Record latency, errors and in-flight calls of a sync or async function.
+
+    Labelled children are bound once here, so a call costs a clock read, a
+    gauge inc/dec and one histogram observation.
+    """
+    latency = STAGE_LATENCY.labels(stage)
+    in_flight = STAGE_IN_FLIGHT.labels(stage)
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                in_flight.inc()
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    record_stage_error(stage, e)
+                    raise
+                finally:
+                    latency.observe(time.perf_counter() - start)
+                    in_flight.dec()
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            in_flight.inc()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                record_stage_error(stage, e)
+                raise
+            finally:
+                latency.observe(time.perf_counter() - start)
+                in_flight.dec()
+
+        return wrapper
+
+    return decorator
+
+
+def render_metrics() -> bytes:
+    """Current metrics in the Prometheus text format, aggregated across workers if needed."""
+    if _MULTIPROCESS_DIR:
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
@@ -1,25 +1,82 @@
-from fastapi import FastAPI, Request
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+
+# Read .env before any app module reads its settings from the environment
+load_dotenv()
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 from .api.routes import router
-from .core.config import CORS_ORIGINS, API_TITLE, API_DESCRIPTION, API_VERSION
+from .core.config import (
+    CORS_ORIGINS,
+    API_TITLE,
+    API_DESCRIPTION,
+    API_VERSION,
+    PDF_RENDER_BACKEND,
+    STARTUP_WARMUP,
+    STARTUP_WARMUP_TIMEOUT_SECONDS,
+    METRICS_ENABLED,
+)
+from .core.metrics import render_metrics, METRICS_CONTENT_TYPE
+from .core.logging_config import setup_logging, shutdown_logging, RequestIdMiddleware
+from .services.llm_client import init_llm_client, close_llm_client
+from .services.pdf_renderer import init_pdf_renderer, close_pdf_renderer
+from .services.docraptor_client import init_docraptor_client, close_docraptor_client
+from .services.job_queue import enhance_job_queue
+from .services.resilience import DeadlineMiddleware
+from .services.artifact_store import artifact_store
+from .services.rate_limiter import limiter
+from .services.template_registry import get_template_registry
+from .utils.keyword_matcher import get_skill_matcher
+
+logger = logging.getLogger(__name__)
+
+
+async def _warm_up(name: str, client):
+    """Pre-open a client's upstream connection; a failure only costs the first request a handshake."""
+    if client is None:
+        return
+    try:
+        await asyncio.wait_for(client.warm_up(), timeout=STARTUP_WARMUP_TIMEOUT_SECONDS)
+        logger.info("Warmed up %s connection", name)
+    except Exception as e:
+        logger.warning("Skipping %s warm-up: %s: %s", name, type(e).__name__, e)
 
-# Create rate limiter
-limiter = Limiter(key_func=get_remote_address)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared upstream clients on startup and close them on shutdown."""
+    setup_logging()
+    llm_client = init_llm_client()
+    get_skill_matcher()  # Compile the skill taxonomy once, before the first request
+    get_template_registry()  # Compile resume layouts and read their stylesheets once
+    docraptor_client = init_docraptor_client()
+    if PDF_RENDER_BACKEND == "weasyprint":
+        init_pdf_renderer()
+    artifact_store.start()
+    enhance_job_queue.start()
+    if STARTUP_WARMUP:
+        await asyncio.gather(_warm_up("OpenAI", llm_client), _warm_up("DocRaptor", docraptor_client))
+    yield
+    await enhance_job_queue.stop()
+    await enhance_job_queue.aclose()
+    await artifact_store.stop()
+    close_pdf_renderer()
+    await close_docraptor_client()
+    await close_llm_client()
+    await limiter.aclose()
+    shutdown_logging()
 
 # Create FastAPI application
 app = FastAPI(
     title=API_TITLE,
     description=API_DESCRIPTION,
-    version=API_VERSION
+    version=API_VERSION,
+    lifespan=lifespan
 )
 
-# Add rate limiter to app state
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -29,19 +86,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Time budget for each request's upstream calls
+app.add_middleware(DeadlineMiddleware)
+
+# Outermost, so every request and its access log line get a request ID
+app.add_middleware(RequestIdMiddleware)
+
 # Include API routes
 app.include_router(router)
 
 @app.get("/")
-@limiter.limit("5/minute")
+@limiter.limit("5/minute", scope="root")
 async def read_root(request: Request):
     """Root endpoint with API information."""
     return {
         "message": "Welcome to the Resume Analyzer API!",
         "version": API_VERSION,
         "endpoints": {
+            "upload_document": "POST /documents/ - Store a resume or job description and get its ID",
+            "get_document": "GET /documents/{document_id} - Fetch a stored document",
             "analyze": "POST /analyze/ - Analyze resume against job description",
+            "analyze_stream": "POST /analyze/stream/ - Stream analysis results as NDJSON",
+            "analyze_batch": "POST /analyze/batch/ - Analyze one resume against many job descriptions",
+            "analyze_batch_stream": "POST /analyze/batch/stream/ - Stream batch results as NDJSON as each finishes",
             "enhance": "POST /enhance-resume/ - Generate an enhanced resume PDF",
-            "download": "GET /download-pdf/{filename} - Download generated PDF"
+            "enhance_stream": "POST /enhance-resume/stream/ - Stream the enhanced resume and a live HTML preview as NDJSON",
+            "enhance_job": "POST /enhance-resume/jobs/ - Queue an enhanced resume PDF (202 + job id)",
+            "enhance_job_status": "GET /enhance-resume/jobs/{job_id} - Poll an enhance job's stage and result",
+            "download": "GET /download-pdf/{filename} - Download generated PDF",
+            "cache_stats": "GET /cache-stats/ - Analysis cache counters",
+            "artifact_stats": "GET /artifact-stats/ - Generated PDF storage occupancy",
+            "metrics": "GET /metrics - Prometheus metrics"
         }
-    } 
\ No newline at end of file
+    }
+
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus scrape endpoint; not rate limited."""
+        return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE) 
\ No newline at end of file
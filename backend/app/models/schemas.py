@@ -1,9 +1,32 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Literal
+
+# "llm": GPT-4 produces everything. "hybrid": GPT-4 score and summary with
+# keywords from the local skill matcher. "local": no LLM call at all.
+AnalysisMode = Literal["llm", "hybrid", "local"]
+
+# Resume layouts registered in app/services/template_registry.py
+ResumeLayout = Literal["modern", "classic"]
+
+# Requests carry each document either inline as text or as the ID returned by
+# POST /documents/, which avoids resending large texts between steps. IDs are
+# sha256 hex digests and name files on disk, so nothing else is accepted.
+DOCUMENT_ID_PATTERN = r"^[0-9a-f]{64}$"
+
+class DocumentUploadRequest(BaseModel):
+    text: str
+
+class DocumentResponse(BaseModel):
+    document_id: str
+    characters: int
+    text: Optional[str] = None
 
 class AnalysisRequest(BaseModel):
-    resume_text: str
-    job_description_text: str
+    resume_text: Optional[str] = None
+    job_description_text: Optional[str] = None
+    resume_id: Optional[str] = Field(default=None, pattern=DOCUMENT_ID_PATTERN)
+    job_description_id: Optional[str] = Field(default=None, pattern=DOCUMENT_ID_PATTERN)
+    mode: AnalysisMode = "llm"
 
 class AnalysisResponse(BaseModel):
     compatibility_score: float
@@ -11,16 +34,45 @@ class AnalysisResponse(BaseModel):
     matched_keywords: List[str]
     missing_keywords: List[str]
 
-class EnhancedResumeRequest(BaseModel):
+class BatchAnalysisRequest(BaseModel):
     resume_text: str
-    job_description_text: str
+    job_description_texts: List[str]
+    mode: AnalysisMode = "llm"
+
+class BatchAnalysisItem(BaseModel):
+    index: int  # Position of the job description in the request
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+class BatchAnalysisResponse(BaseModel):
+    results: List[BatchAnalysisItem]
+    succeeded: int
+    failed: int
+
+class EnhancedResumeRequest(BaseModel):
+    resume_text: Optional[str] = None
+    job_description_text: Optional[str] = None
+    resume_id: Optional[str] = Field(default=None, pattern=DOCUMENT_ID_PATTERN)
+    job_description_id: Optional[str] = Field(default=None, pattern=DOCUMENT_ID_PATTERN)
     applicant_name: str
     contact_info: str
     github_link: Optional[str] = None
     linkedin_link: Optional[str] = None
     portfolio_link: Optional[str] = None
     improvement_suggestions: Optional[str] = None
+    layout: Optional[ResumeLayout] = None
 
 class EnhancedResumeResponse(BaseModel):
     pdf_url: str
-    improvement_summary: str 
\ No newline at end of file
+    improvement_summary: str
+    stage_timings: Optional[Dict[str, float]] = None
+
+class EnhanceJobStatus(BaseModel):
+    job_id: str
+    stage: str  # queued, enhancing, summarizing_and_rendering, done or failed
+    status_url: str
+    pdf_url: Optional[str] = None
+    improvement_summary: Optional[str] = None
+    error: Optional[str] = None
+    stage_timings: Optional[Dict[str, float]] = None
\ No newline at end of file
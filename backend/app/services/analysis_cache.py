@@ -0,0 +1,178 @@
+# app/services/analysis_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from ..core.config import (
+    ANALYSIS_CACHE_MAX_ENTRIES,
+    ANALYSIS_CACHE_TTL_SECONDS,
+    ANALYSIS_CACHE_DIR,
+    ANALYSIS_CACHE_MAX_DISK_ENTRIES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Number of disk writes between checks of the on-disk entry count
+_DISK_PRUNE_INTERVAL = 64
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace so cosmetic edits do not change the cache key."""
+    return " ".join(text.split())
+
+
+def content_id(text: str) -> str:
+    """Content hash of a text, stable across whitespace-only edits."""
+    return hashlib.sha256(_normalize(text).encode("utf-8")).hexdigest()
+
+
+def analysis_cache_key(resume_text: str, job_description_text: str, model: str, prompt_version: str) -> str:
+    """Build a content-addressed key for an analysis request from the documents' content IDs."""
+    digest = hashlib.sha256()
+    for part in (model, prompt_version, content_id(resume_text), content_id(job_description_text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """In-memory LRU cache with TTL for JSON-serializable values, with an optional disk tier.
+
+    Used for parsed analyses, and by the document store for uploaded texts.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, disk_dir: str = "", max_disk_entries: int = 0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._disk_writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[dict]:
+        """Return a cached analysis, checking memory first and then disk."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if time.time() - stored_at < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.evictions += 1
+
+        if self.disk_dir:
+            disk_entry = await asyncio.to_thread(self._read_disk, key)
+            if disk_entry is not None:
+                self._store_memory(key, *disk_entry)
+                self.disk_hits += 1
+                return disk_entry[1]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: dict):
+        """Store an analysis in memory and, if enabled, on disk."""
+        stored_at = time.time()
+        self._store_memory(key, stored_at, value)
+        if self.disk_dir:
+            try:
+                await asyncio.to_thread(self._write_disk, key, stored_at, value)
+            except OSError as e:
+                # The entry is still cached in memory; a failed disk write must not fail the request
+                logger.warning("Could not write cache entry to disk: %s", e, extra={"cache_dir": self.disk_dir})
+
+    def clear(self):
+        """Drop all in-memory entries."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and current occupancy."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "disk_enabled": bool(self.disk_dir),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _store_memory(self, key: str, stored_at: float, value: dict):
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str):
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+            stored_at, value = record["stored_at"], record["value"]
+            expired = time.time() - stored_at >= self.ttl_seconds
+        except (OSError, ValueError, KeyError, TypeError):
+            # Unreadable or malformed entries are misses, not errors
+            return None
+        if expired:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return stored_at, value
+
+    def _write_disk(self, key: str, stored_at: float, value: dict):
+        os.makedirs(self.disk_dir, exist_ok=True)
+        path = self._disk_path(key)
+        # Unique per write, so concurrent sets of the same key never share a temp file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": stored_at, "value": value}, f)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        self._disk_writes += 1
+        if self._disk_writes % _DISK_PRUNE_INTERVAL == 0:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Remove the oldest disk entries once the directory exceeds its bound."""
+        with os.scandir(self.disk_dir) as it:
+            files = [(entry.stat().st_mtime, entry.path) for entry in it if entry.name.endswith(".json")]
+        excess = len(files) - self.max_disk_entries
+        if excess <= 0:
+            return
+        files.sort()
+        for _, path in files[:excess]:
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except OSError:
+                pass
+
+
+analysis_cache = AnalysisCache(
+    max_entries=ANALYSIS_CACHE_MAX_ENTRIES,
+    ttl_seconds=ANALYSIS_CACHE_TTL_SECONDS,
+    disk_dir=ANALYSIS_CACHE_DIR,
+    max_disk_entries=ANALYSIS_CACHE_MAX_DISK_ENTRIES,
+)
@@ -0,0 +1,124 @@
+# app/services/analysis_service.py
+import asyncio
+import logging
+from typing import List, Tuple
+
+from fastapi import HTTPException
+from ..core.config import ANALYZE_BATCH_CONCURRENCY, ANALYSIS_OUTPUT_FORMAT
+from ..models.schemas import AnalysisResponse, BatchAnalysisItem
+from .analysis_cache import analysis_cache, analysis_cache_key
+from .openai_service import analyze_resume, analysis_cache_identity
+from ..utils.response_parser import parse_ai_response, parse_structured_ai_response
+from ..utils.keyword_matcher import get_skill_matcher
+
+logger = logging.getLogger(__name__)
+
+
+def is_cacheable_analysis(parsed_response: dict) -> bool:
+    """Only cache responses that actually parsed, not the score-0 fallback."""
+    return bool(parsed_response["compatibility_score"] or parsed_response["matched_keywords"] or parsed_response["missing_keywords"])
+
+
+def analyze_keywords_locally(resume_text: str, job_description_text: str) -> dict:
+    """Build an analysis from the local skill matcher alone, without calling the LLM.
+
+    The score is the share of job description skills that also appear in the resume.
+    """
+    matched_keywords, missing_keywords = get_skill_matcher().match(resume_text, job_description_text)
+    total = len(matched_keywords) + len(missing_keywords)
+    compatibility_score = round(100.0 * len(matched_keywords) / total, 1) if total else 0.0
+
+    suggestions = []
+    if missing_keywords:
+        suggestions.append(f"- Add or highlight these skills from the job description: {', '.join(missing_keywords)}")
+    if matched_keywords:
+        suggestions.append(f"- Keep emphasizing skills the job description asks for: {', '.join(matched_keywords)}")
+    if not suggestions:
+        suggestions.append("- No known skills were found in the job description.")
+
+    return {
+        "compatibility_score": compatibility_score,
+        "improvement_summary": "\n".join(suggestions),
+        "matched_keywords": matched_keywords,
+        "missing_keywords": missing_keywords
+    }
+
+
+async def get_analysis(resume_text: str, job_description_text: str, bypass_cache: bool = False, mode: str = "llm") -> Tuple[dict, bool]:
+    """Return the parsed analysis and whether it was served from the cache.
+
+    ``mode`` is "llm", "hybrid" (LLM score and summary, local keywords) or
+    "local" (no LLM call).
+    """
+    if mode == "local":
+        return analyze_keywords_locally(resume_text, job_description_text), False
+
+    parsed_response, cache_hit = await _get_llm_analysis(resume_text, job_description_text, bypass_cache)
+    if mode == "hybrid":
+        matched_keywords, missing_keywords = get_skill_matcher().match(resume_text, job_description_text)
+        parsed_response = {**parsed_response, "matched_keywords": matched_keywords, "missing_keywords": missing_keywords}
+    return parsed_response, cache_hit
+
+
+async def _get_llm_analysis(resume_text: str, job_description_text: str, bypass_cache: bool) -> Tuple[dict, bool]:
+    model, prompt_version = analysis_cache_identity(ANALYSIS_OUTPUT_FORMAT)
+    cache_key = analysis_cache_key(resume_text, job_description_text, model, prompt_version)
+    if not bypass_cache:
+        parsed_response = await analysis_cache.get(cache_key)
+        if parsed_response is not None:
+            logger.info("Serving analysis from cache", extra={"sampled": True})
+            return parsed_response, True
+
+    # Get AI analysis
+    ai_response_text = await analyze_resume(resume_text, job_description_text, ANALYSIS_OUTPUT_FORMAT)
+
+    # Parse the response
+    if ANALYSIS_OUTPUT_FORMAT == "json":
+        try:
+            parsed_response = parse_structured_ai_response(ai_response_text)
+        except ValueError as e:
+            logger.warning("Structured analysis failed validation: %s", e)
+            raise HTTPException(status_code=502, detail="The AI returned an analysis that did not match the expected format. Please try again.")
+    else:
+        parsed_response = parse_ai_response(ai_response_text)
+
+    if is_cacheable_analysis(parsed_response):
+        await analysis_cache.set(cache_key, parsed_response)
+    return parsed_response, False
+
+
+async def iter_batch_analyses(
+    resume_text: str,
+    job_description_texts: List[str],
+    bypass_cache: bool = False,
+    concurrency: int = ANALYZE_BATCH_CONCURRENCY,
+    mode: str = "llm"
+):
+    """Analyze one resume against many job descriptions, yielding items as each finishes.
+
+    At most ``concurrency`` analyses run at once. A failing job description
+    produces an item with ``error`` set instead of failing the whole batch.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def analyze_one(index: int, job_description_text: str) -> BatchAnalysisItem:
+        if not job_description_text:
+            return BatchAnalysisItem(index=index, error="Job description text cannot be empty.")
+        async with semaphore:
+            try:
+                parsed_response, cache_hit = await get_analysis(resume_text, job_description_text, bypass_cache, mode)
+                return BatchAnalysisItem(index=index, result=AnalysisResponse(**parsed_response), cached=cache_hit)
+            except HTTPException as e:
+                return BatchAnalysisItem(index=index, error=str(e.detail))
+            except Exception as e:
+                logger.exception("Batch analysis item failed", extra={"item_index": index})
+                return BatchAnalysisItem(index=index, error=f"An unexpected error occurred during analysis: {str(e)}")
+
+    tasks = [asyncio.ensure_future(analyze_one(index, text)) for index, text in enumerate(job_description_texts)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Stop outstanding analyses if the client goes away mid-batch
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,176 @@
+# app/services/artifact_store.py
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from ..core.config import (
+    PDF_OUTPUT_DIR,
+    PDF_MAX_AGE_SECONDS,
+    PDF_MAX_TOTAL_BYTES,
+    PDF_SWEEP_INTERVAL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# How many evicted filenames to remember so downloads can answer 410 instead of 404
+_MAX_EVICTED_NAMES = 10000
+
+
+class Artifact:
+    """Bookkeeping for one generated file."""
+
+    __slots__ = ("size", "created_at", "last_access")
+
+    def __init__(self, size: int, created_at: float, last_access: float):
+        self.size = size
+        self.created_at = created_at
+        self.last_access = last_access
+
+
+class ArtifactStore:
+    """Owns the PDF output directory and evicts files by age and total size.
+
+    Artifacts are tracked in least-recently-used order. A background task
+    periodically removes artifacts older than ``max_age_seconds`` and then the
+    least recently used ones until the directory fits in ``max_total_bytes``.
+
+    The index lives in process memory. With several workers sharing the
+    directory, each one re-reads the directory before every periodic sweep,
+    so the quota applies to the directory as a whole, but only between
+    sweeps; a worker can overshoot it by what others wrote since. Names
+    remembered for 410 responses are per worker: a file evicted by one
+    worker is a 404, not a 410, when another worker answers the download.
+    """
+
+    def __init__(self, directory: str, max_age_seconds: float, max_total_bytes: int, sweep_interval_seconds: float):
+        self.directory = directory
+        self.max_age_seconds = max_age_seconds
+        self.max_total_bytes = max_total_bytes
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._artifacts = OrderedDict()
+        self._evicted = OrderedDict()
+        self._total_bytes = 0
+        self._directory_ready = False
+        self._sweeper: Optional[asyncio.Task] = None
+        self.evictions = 0
+
+    def path_for(self, filename: str) -> str:
+        """Return the absolute path for an artifact, creating the directory on first use."""
+        if not self._directory_ready:
+            os.makedirs(self.directory, exist_ok=True)
+            self._directory_ready = True
+        return os.path.join(self.directory, filename)
+
+    def start(self):
+        """Index files already on disk and start the background sweeper."""
+        self._scan()
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_periodically())
+
+    async def stop(self):
+        """Stop the background sweeper."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    def register(self, filename: str):
+        """Record a newly written artifact."""
+        now = time.time()
+        size = os.path.getsize(self.path_for(filename))
+        self._forget(filename)
+        self._evicted.pop(filename, None)
+        self._artifacts[filename] = Artifact(size, now, now)
+        self._total_bytes += size
+        if self._total_bytes > self.max_total_bytes:
+            self.sweep()
+
+    def touch(self, filename: str) -> bool:
+        """Mark an artifact as used. Returns False if it is not in the store."""
+        artifact = self._artifacts.get(filename)
+        if artifact is None:
+            # Files written before a restart, or by another worker, are adopted on first access
+            path = self.path_for(filename)
+            if not os.path.isfile(path):
+                return False
+            stat = os.stat(path)
+            artifact = Artifact(stat.st_size, stat.st_mtime, stat.st_mtime)
+            self._artifacts[filename] = artifact
+            self._total_bytes += stat.st_size
+        artifact.last_access = time.time()
+        self._artifacts.move_to_end(filename)
+        return True
+
+    def was_evicted(self, filename: str) -> bool:
+        return filename in self._evicted
+
+    def sweep(self):
+        """Evict expired artifacts, then least recently used ones until under the size quota."""
+        cutoff = time.time() - self.max_age_seconds
+        for filename in [name for name, artifact in self._artifacts.items() if artifact.created_at < cutoff]:
+            self._evict(filename)
+        while self._total_bytes > self.max_total_bytes and self._artifacts:
+            self._evict(next(iter(self._artifacts)))
+
+    def stats(self) -> dict:
+        """Return occupancy and eviction counters."""
+        return {
+            "directory": self.directory,
+            "artifacts": len(self._artifacts),
+            "total_bytes": self._total_bytes,
+            "max_total_bytes": self.max_total_bytes,
+            "max_age_seconds": self.max_age_seconds,
+            "evictions": self.evictions,
+        }
+
+    def _scan(self):
+        """Sync the index with the directory: adopt files written by other workers, drop removed ones."""
+        self.path_for("")
+        with os.scandir(self.directory) as it:
+            entries = [(entry.stat(), entry.name) for entry in it if entry.is_file() and entry.name.endswith(".pdf")]
+        on_disk = {name for _, name in entries}
+        for name in [name for name in self._artifacts if name not in on_disk]:
+            self._forget(name)
+        for stat, name in sorted(entries, key=lambda item: item[0].st_mtime):
+            if name not in self._artifacts:
+                self._artifacts[name] = Artifact(stat.st_size, stat.st_mtime, stat.st_mtime)
+                self._total_bytes += stat.st_size
+
+    def _forget(self, filename: str):
+        artifact = self._artifacts.pop(filename, None)
+        if artifact is not None:
+            self._total_bytes -= artifact.size
+
+    def _evict(self, filename: str):
+        self._forget(filename)
+        try:
+            os.remove(os.path.join(self.directory, filename))
+        except FileNotFoundError:
+            pass
+        self._evicted[filename] = time.time()
+        while len(self._evicted) > _MAX_EVICTED_NAMES:
+            self._evicted.popitem(last=False)
+        self.evictions += 1
+
+    async def _sweep_periodically(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            try:
+                self._scan()
+                self.sweep()
+            except Exception:
+                logger.exception("Artifact sweep failed")
+
+
+artifact_store = ArtifactStore(
+    directory=PDF_OUTPUT_DIR,
+    max_age_seconds=PDF_MAX_AGE_SECONDS,
+    max_total_bytes=PDF_MAX_TOTAL_BYTES,
+    sweep_interval_seconds=PDF_SWEEP_INTERVAL_SECONDS,
+)
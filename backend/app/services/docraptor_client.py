@@ -0,0 +1,203 @@
+# app/services/docraptor_client.py
+import asyncio
+import base64
+import logging
+import os
+import random
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from fastapi import HTTPException
+from ..core.config import (
+    DOCRAPTOR_API_KEY,
+    DOCRAPTOR_URL,
+    DOCRAPTOR_CONNECT_TIMEOUT_SECONDS,
+    DOCRAPTOR_READ_TIMEOUT_SECONDS,
+    DOCRAPTOR_MAX_CONNECTIONS,
+    DOCRAPTOR_MAX_RETRIES,
+    DOCRAPTOR_BACKOFF_BASE_SECONDS,
+    DOCRAPTOR_HEDGE_ENABLED,
+)
+from .resilience import CircuitBreaker, LatencyTracker, call_timeout, deadline_exceeded, hedged
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# Cap on a single backoff sleep, including any Retry-After sent by DocRaptor
+_MAX_BACKOFF_SECONDS = 10.0
+
+
+class DocRaptorError(Exception):
+    """DocRaptor returned an error status or could not be reached."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Connection failures, timeouts, 429 and 5xx; other 4xx mean the request itself was bad."""
+    if not isinstance(error, DocRaptorError):
+        return False
+    return error.status_code is None or error.status_code == 429 or error.status_code >= 500
+
+
+class DocRaptorClient:
+    """Pooled, keep-alive DocRaptor client that streams rendered PDFs to disk.
+
+    Renders go through a circuit breaker and the request deadline, and are
+    hedged when enabled (each hedge is another billed document).
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        url: str = DOCRAPTOR_URL,
+        connect_timeout: float = DOCRAPTOR_CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = DOCRAPTOR_READ_TIMEOUT_SECONDS,
+        max_connections: int = DOCRAPTOR_MAX_CONNECTIONS,
+        max_retries: int = DOCRAPTOR_MAX_RETRIES,
+        backoff_base: float = DOCRAPTOR_BACKOFF_BASE_SECONDS,
+        hedge: bool = DOCRAPTOR_HEDGE_ENABLED,
+    ):
+        import httpx
+
+        self.url = url
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.hedge = hedge
+        self.breaker = CircuitBreaker("docraptor", "DocRaptor", is_transient_error)
+        self._latency = LatencyTracker()
+        # Build the basic auth header once instead of on every render
+        auth = base64.b64encode(f"{api_key}:".encode("ascii")).decode("ascii")
+        self._client = httpx.AsyncClient(
+            headers={"Authorization": f"Basic {auth}", "Content-Type": "application/json"},
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def render(self, payload: dict, output_path: str) -> int:
+        """Render a document to output_path within the request deadline.
+
+        Raises CircuitOpenError (503) without calling DocRaptor while its
+        circuit is open, and 504 when the deadline runs out. Returns the
+        number of bytes written.
+        """
+        timeout = call_timeout("docraptor")
+        delay = self._latency.hedge_delay() if self.hedge else None
+
+        async def attempt(index: int) -> Tuple[int, str]:
+            # Hedged attempts each write their own file; only the winner's is kept
+            path = output_path if delay is None else f"{output_path}.{index}"
+            start = time.perf_counter()
+            size = await self.render_to_file(payload, path)
+            self._latency.observe(time.perf_counter() - start)
+            return size, path
+
+        try:
+            # The deadline is the caller's limit, not DocRaptor's health, so it is applied
+            # outside the breaker: running out of it cancels the call without counting a failure.
+            # DocRaptor's own read timeout surfaces as a transient DocRaptorError and does count.
+            size, path = await asyncio.wait_for(self.breaker.call(lambda: hedged("docraptor", attempt, delay)), timeout)
+        except asyncio.TimeoutError:
+            raise deadline_exceeded("docraptor") from None
+        if path != output_path:
+            os.replace(path, output_path)
+        return size
+
+    async def render_to_file(self, payload: dict, output_path: str) -> int:
+        """POST a document to DocRaptor and stream the PDF to output_path.
+
+        Retries connection errors, timeouts, 429 and 5xx responses with jittered
+        exponential backoff. Returns the number of bytes written.
+        """
+        import httpx
+
+        attempt = 0
+        while True:
+            try:
+                async with self._client.stream("POST", self.url, json=payload) as response:
+                    logger.debug("DocRaptor responded", extra={"sampled": True, "status": response.status_code})
+                    if response.status_code < 400:
+                        return await self._write_body(response, output_path)
+
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    error = DocRaptorError(f"DocRaptor returned {response.status_code}: {body[:500]}", response.status_code)
+                    retryable = response.status_code == 429 or response.status_code >= 500
+                    retry_after = response.headers.get("Retry-After")
+            except httpx.TransportError as e:
+                error = DocRaptorError(f"DocRaptor request failed: {type(e).__name__}: {e}")
+                retryable = True
+                retry_after = None
+
+            if not retryable or attempt >= self.max_retries:
+                raise error
+
+            delay = self._backoff(attempt, retry_after)
+            logger.warning("Retrying DocRaptor request in %.2fs: %s", delay, error, extra={"attempt": attempt + 1})
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Full-jitter exponential backoff, honouring a numeric Retry-After header."""
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), _MAX_BACKOFF_SECONDS)
+        return random.uniform(0, min(self.backoff_base * (2 ** attempt), _MAX_BACKOFF_SECONDS))
+
+    async def _write_body(self, response: "httpx.Response", output_path: str) -> int:
+        size = 0
+        try:
+            with open(output_path, "wb") as f:
+                async for chunk in response.aiter_bytes():
+                    f.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+        return size
+
+    async def warm_up(self):
+        """Open a pooled connection to DocRaptor ahead of the first render.
+
+        Any HTTP response counts; only the TLS connection left in the pool matters.
+        """
+        await self._client.head(self.url)
+
+    async def aclose(self):
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+
+_docraptor_client: Optional[DocRaptorClient] = None
+
+
+def init_docraptor_client(**kwargs) -> Optional[DocRaptorClient]:
+    """Create the shared client. Called once from the application lifespan."""
+    global _docraptor_client
+    if _docraptor_client is None and DOCRAPTOR_API_KEY:
+        _docraptor_client = DocRaptorClient(api_key=DOCRAPTOR_API_KEY, **kwargs)
+    return _docraptor_client
+
+
+def get_docraptor_client() -> DocRaptorClient:
+    """Return the shared client, or fail with 503 if DocRaptor is not configured."""
+    if _docraptor_client is None:
+        raise HTTPException(status_code=503, detail="DocRaptor client not initialized. API key might be missing or invalid.")
+    return _docraptor_client
+
+
+def set_docraptor_client(client: Optional[DocRaptorClient]):
+    """Replace the shared client (used by benchmarks against local stand-ins)."""
+    global _docraptor_client
+    _docraptor_client = client
+
+
+async def close_docraptor_client():
+    """Close the shared client. Called once on application shutdown."""
+    global _docraptor_client
+    if _docraptor_client is not None:
+        await _docraptor_client.aclose()
+        _docraptor_client = None
@@ -0,0 +1,76 @@
+# app/services/document_store.py
+import hashlib
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+from ..core.config import (
+    DOCUMENT_MAX_CHARS,
+    DOCUMENT_STORE_MAX_ENTRIES,
+    DOCUMENT_STORE_TTL_SECONDS,
+    DOCUMENT_STORE_DIR,
+    DOCUMENT_STORE_MAX_DISK_ENTRIES,
+)
+from ..utils.text_compaction import normalize_whitespace
+from .analysis_cache import AnalysisCache
+
+
+class DocumentStore:
+    """Uploaded resumes and job descriptions, addressed by content hash.
+
+    A document's ID is the sha256 of exactly the text that is stored, after
+    whitespace normalization, so uploading the same text twice returns the
+    same ID, while texts differing in line breaks get their own IDs and keep
+    their own layout. Texts expire ``ttl_seconds`` after they were first
+    stored; reading or re-uploading a document does not extend its lifetime.
+
+    Documents are shared between workers through ``disk_dir``; without one
+    an ID only resolves on the worker that issued it.
+    """
+
+    def __init__(self, max_chars: int, max_entries: int, ttl_seconds: float, disk_dir: str = "", max_disk_entries: int = 0):
+        self.max_chars = max_chars
+        self._cache = AnalysisCache(max_entries, ttl_seconds, disk_dir, max_disk_entries)
+
+    async def put(self, text: str) -> Tuple[str, str]:
+        """Store a document and return its ID and normalized text."""
+        text = normalize_whitespace(text)
+        if not text:
+            raise HTTPException(status_code=400, detail="Document text cannot be empty.")
+        if len(text) > self.max_chars:
+            raise HTTPException(status_code=413, detail=f"Document text is limited to {self.max_chars} characters.")
+        document_id = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if await self._cache.get(document_id) is None:
+            await self._cache.set(document_id, {"text": text})
+        return document_id, text
+
+    async def get(self, document_id: str) -> Optional[str]:
+        """Return a stored document's text, or None if unknown or expired."""
+        record = await self._cache.get(document_id)
+        return record["text"] if record is not None else None
+
+    async def resolve(self, text: Optional[str], document_id: Optional[str], field: str) -> Optional[str]:
+        """Return the text a request refers to, given inline text or a document ID.
+
+        ``field`` names the request fields (``<field>_text`` / ``<field>_id``) in errors.
+        """
+        if document_id is None:
+            return text
+        if text:
+            raise HTTPException(status_code=400, detail=f"Provide either {field}_text or {field}_id, not both.")
+        stored = await self.get(document_id)
+        if stored is None:
+            raise HTTPException(status_code=404, detail=f"Document {document_id} was not found or has expired. Please upload it again.")
+        return stored
+
+    def stats(self) -> dict:
+        return {**self._cache.stats(), "max_chars": self.max_chars}
+
+
+document_store = DocumentStore(
+    max_chars=DOCUMENT_MAX_CHARS,
+    max_entries=DOCUMENT_STORE_MAX_ENTRIES,
+    ttl_seconds=DOCUMENT_STORE_TTL_SECONDS,
+    disk_dir=DOCUMENT_STORE_DIR,
+    max_disk_entries=DOCUMENT_STORE_MAX_DISK_ENTRIES,
+)
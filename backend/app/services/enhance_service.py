@@ -0,0 +1,141 @@
+# app/services/enhance_service.py
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from ..core.config import BASE_BACKEND_URL
+from ..models.schemas import EnhancedResumeRequest, EnhancedResumeResponse
+from ..utils.resume_parser import IncrementalResumeParser
+from .openai_service import generate_enhanced_resume, generate_improvement_summary, stream_enhanced_resume
+from .pdf_service import create_resume_html, generate_pdf_from_text
+
+logger = logging.getLogger(__name__)
+
+
+async def _timed(stage_timings: Dict[str, float], name: str, coro):
+    start = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        stage_timings[name] = round(time.perf_counter() - start, 3)
+
+
+async def _summarize_and_render(
+    request_data: EnhancedResumeRequest,
+    enhanced_resume_text: str,
+    stage_timings: Dict[str, float]
+) -> Tuple[str, str]:
+    """Return (improvement summary, PDF filename) for the enhanced text."""
+    # The improvement summary and the PDF both depend only on the enhanced text,
+    # so run them concurrently
+    summary_task = asyncio.ensure_future(_timed(stage_timings, "summary", generate_improvement_summary(
+        request_data.resume_text,
+        enhanced_resume_text,
+        request_data.job_description_text
+    )))
+    render_task = asyncio.ensure_future(_timed(stage_timings, "render", generate_pdf_from_text(
+        enhanced_resume_text,
+        request_data.applicant_name,
+        request_data.contact_info,
+        request_data.github_link,
+        request_data.linkedin_link,
+        request_data.portfolio_link,
+        request_data.layout
+    )))
+    try:
+        improvement_summary, pdf_filename = await asyncio.gather(summary_task, render_task)
+    except BaseException:
+        summary_task.cancel()
+        render_task.cancel()
+        raise
+    return improvement_summary, pdf_filename
+
+
+def _enhance_response(improvement_summary: str, pdf_filename: str, stage_timings: Dict[str, float]) -> EnhancedResumeResponse:
+    logger.info("Enhance pipeline finished", extra={"sampled": True, "stage_timings": stage_timings})
+    # Create a fully qualified URL for the PDF
+    return EnhancedResumeResponse(
+        pdf_url=f"{BASE_BACKEND_URL}/download-pdf/{pdf_filename}",
+        improvement_summary=improvement_summary,
+        stage_timings=stage_timings
+    )
+
+
+async def run_enhance_pipeline(
+    request_data: EnhancedResumeRequest,
+    on_stage: Optional[Callable[[str], None]] = None
+) -> EnhancedResumeResponse:
+    """Enhance a resume, summarize the changes and render the PDF.
+
+    ``on_stage`` is called with "enhancing" and then "summarizing_and_rendering"
+    as the pipeline moves through each step. Per-stage durations in seconds are
+    returned in ``stage_timings``.
+    """
+    def report(stage: str):
+        if on_stage is not None:
+            on_stage(stage)
+
+    stage_timings = {}
+    pipeline_start = time.perf_counter()
+
+    # Enhance the resume based on job description and improvement suggestions
+    report("enhancing")
+    enhanced_resume_text = await _timed(stage_timings, "enhance", generate_enhanced_resume(
+        request_data.resume_text,
+        request_data.job_description_text,
+        request_data.improvement_suggestions
+    ))
+
+    report("summarizing_and_rendering")
+    improvement_summary, pdf_filename = await _summarize_and_render(request_data, enhanced_resume_text, stage_timings)
+
+    stage_timings["total"] = round(time.perf_counter() - pipeline_start, 3)
+    return _enhance_response(improvement_summary, pdf_filename, stage_timings)
+
+
+async def stream_enhance_pipeline(request_data: EnhancedResumeRequest) -> AsyncIterator[Tuple[str, Any]]:
+    """Run the enhance pipeline, yielding ``(event, data)`` tuples as it goes.
+
+    Events are ``token`` with each piece of enhanced text as it arrives,
+    ``section`` with ``{"name", "html"}`` each time a resume section completes,
+    where ``html`` is the layout rendered from every section completed so far,
+    and a final ``result`` with the same fields as ``run_enhance_pipeline``.
+    """
+    stage_timings = {}
+    pipeline_start = time.perf_counter()
+    parser = IncrementalResumeParser()
+
+    def preview(sections: List[str]) -> list:
+        if not sections:
+            return []
+        html = create_resume_html(
+            parser.completed_text,
+            request_data.applicant_name,
+            request_data.contact_info,
+            request_data.github_link,
+            request_data.linkedin_link,
+            request_data.portfolio_link,
+            request_data.layout
+        )
+        # Sections completed by the same chunk share one render
+        return [("section", {"name": name, "html": html}) for name in sections]
+
+    async for text in stream_enhanced_resume(
+        request_data.resume_text,
+        request_data.job_description_text,
+        request_data.improvement_suggestions
+    ):
+        if "first_token" not in stage_timings:
+            stage_timings["first_token"] = round(time.perf_counter() - pipeline_start, 3)
+        yield "token", text
+        for event in preview(parser.feed(text)):
+            yield event
+    for event in preview(parser.finish()):
+        yield event
+    stage_timings["enhance"] = round(time.perf_counter() - pipeline_start, 3)
+
+    improvement_summary, pdf_filename = await _summarize_and_render(request_data, parser.text.strip(), stage_timings)
+
+    stage_timings["total"] = round(time.perf_counter() - pipeline_start, 3)
+    yield "result", _enhance_response(improvement_summary, pdf_filename, stage_timings).model_dump()
@@ -0,0 +1,281 @@
+# app/services/job_queue.py
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Set
+
+from fastapi import HTTPException
+from ..core.config import (
+    ENHANCE_JOB_STORAGE_URI,
+    ENHANCE_JOB_WORKERS,
+    ENHANCE_JOB_MAX_QUEUE,
+    ENHANCE_JOB_TTL_SECONDS,
+    ENHANCE_JOB_BUDGET_SECONDS,
+)
+from ..core.logging_config import get_request_id, reset_request_id, set_request_id
+from ..models.schemas import EnhancedResumeRequest
+from .enhance_service import run_enhance_pipeline
+from .resilience import request_deadline
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STAGES = ("done", "failed")
+
+# Number of status writes between removals of expired jobs from storage
+_PRUNE_INTERVAL = 100
+
+
+class EnhanceJob:
+    """State of one background resume enhancement."""
+
+    def __init__(self, request_data: EnhancedResumeRequest):
+        self.job_id = uuid.uuid4().hex
+        self.request_data = request_data
+        # Workers log under the ID of the request that submitted the job
+        self.request_id = get_request_id()
+        self.stage = "queued"
+        self.pdf_url: Optional[str] = None
+        self.improvement_summary: Optional[str] = None
+        self.error: Optional[str] = None
+        self.stage_timings: Optional[Dict[str, float]] = None
+        self.updated_at = time.time()
+
+    def set_stage(self, stage: str):
+        self.stage = stage
+        self.updated_at = time.time()
+
+    def status(self) -> dict:
+        """The fields reported to clients polling the job."""
+        return {
+            "job_id": self.job_id,
+            "stage": self.stage,
+            "pdf_url": self.pdf_url,
+            "improvement_summary": self.improvement_summary,
+            "error": self.error,
+            "stage_timings": self.stage_timings,
+        }
+
+
+class MemoryJobStorage:
+    """Job status in process memory; only for a single worker process."""
+
+    def __init__(self):
+        self._statuses: Dict[str, tuple] = {}
+        self._puts = 0
+
+    async def put(self, status: dict, ttl_seconds: float):
+        now = time.time()
+        self._statuses[status["job_id"]] = (status, now + ttl_seconds)
+        self._puts += 1
+        if self._puts % _PRUNE_INTERVAL == 0:
+            for job_id in [job_id for job_id, (_, expires_at) in self._statuses.items() if expires_at < now]:
+                del self._statuses[job_id]
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        entry = self._statuses.get(job_id)
+        if entry is None or entry[1] < time.time():
+            return None
+        return entry[0]
+
+    async def aclose(self):
+        pass
+
+
+class SQLiteJobStorage:
+    """Job status in a SQLite file, shared by every process on the host."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._puts = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, status TEXT NOT NULL, expires_at REAL NOT NULL)")
+            self._connection = connection
+        return self._connection
+
+    def _put(self, status: dict, ttl_seconds: float):
+        with self._lock:
+            connection = self._connect()
+            now = time.time()
+            connection.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, expires_at) VALUES (?, ?, ?)",
+                (status["job_id"], json.dumps(status), now + ttl_seconds)
+            )
+            self._puts += 1
+            if self._puts % _PRUNE_INTERVAL == 0:
+                connection.execute("DELETE FROM jobs WHERE expires_at < ?", (now,))
+
+    def _get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT status FROM jobs WHERE job_id = ? AND expires_at >= ?", (job_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def put(self, status: dict, ttl_seconds: float):
+        await asyncio.to_thread(self._put, status, ttl_seconds)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self._get, job_id)
+
+    async def aclose(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class RedisJobStorage:
+    """Job status in a Redis-compatible server, shared by every instance.
+
+    Requires the ``redis`` package.
+    """
+
+    def __init__(self, url: str, key_prefix: str = "enhance-job:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("ENHANCE_JOB_STORAGE_URI points at Redis but the 'redis' package is not installed.") from e
+        self.key_prefix = key_prefix
+        self._client = redis_asyncio.from_url(url)
+
+    async def put(self, status: dict, ttl_seconds: float):
+        await self._client.set(self.key_prefix + status["job_id"], json.dumps(status), px=int(ttl_seconds * 1000))
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        value = await self._client.get(self.key_prefix + job_id)
+        return json.loads(value) if value is not None else None
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+def job_storage_from_uri(uri: str):
+    """Create job status storage from "memory://", "sqlite:///path" or "redis://..." URIs."""
+    if uri.startswith("memory://"):
+        return MemoryJobStorage()
+    if uri.startswith("sqlite:///"):
+        return SQLiteJobStorage(uri[len("sqlite:///"):])
+    if uri.startswith(("redis://", "rediss://", "unix://")):
+        return RedisJobStorage(uri)
+    raise ValueError(f"Unsupported enhance job storage {uri!r}")
+
+
+class EnhanceJobQueue:
+    """Bounded queue of enhance jobs processed by a fixed number of worker tasks.
+
+    Jobs run on the worker process that accepted them, but their status is
+    written to shared storage at every stage, so any worker can answer a poll.
+    Statuses are kept for ``ttl_seconds`` after their last update.
+    """
+
+    def __init__(self, workers: int, max_queue: int, ttl_seconds: float, storage):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.ttl_seconds = ttl_seconds
+        self.storage = storage
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._publish_tasks: Set[asyncio.Task] = set()
+        self._publish_locks: Dict[str, asyncio.Lock] = {}
+
+    def start(self):
+        """Start the worker tasks on the running event loop."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the worker tasks. Jobs still queued are abandoned."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        await asyncio.gather(*self._publish_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+
+    async def aclose(self):
+        """Close the status storage."""
+        await self.storage.aclose()
+
+    async def submit(self, request_data: EnhancedResumeRequest) -> EnhanceJob:
+        """Queue a job, or fail with 503 when the queue is full."""
+        self.start()
+        job = EnhanceJob(request_data)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="Too many resume enhancements in progress. Please try again shortly.")
+        await self._publish(job)
+        return job
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        """Return a job's latest status from shared storage, or None if unknown or expired."""
+        return await self.storage.get(job_id)
+
+    def _set_stage(self, job: EnhanceJob, stage: str):
+        """Pipeline stage callback: update the job and publish it without blocking the pipeline."""
+        job.set_stage(stage)
+        task = asyncio.ensure_future(self._publish(job))
+        self._publish_tasks.add(task)
+        task.add_done_callback(self._publish_tasks.discard)
+
+    async def _publish(self, job: EnhanceJob):
+        # Writes of one job are serialized and each writes the job's state as of
+        # the write, so a slow earlier write can never overwrite a later stage
+        lock = self._publish_locks.setdefault(job.job_id, asyncio.Lock())
+        try:
+            async with lock:
+                await self.storage.put(job.status(), self.ttl_seconds)
+        except Exception:
+            logger.exception("Could not store enhance job status", extra={"job_id": job.job_id, "stage": job.stage})
+        finally:
+            if job.stage in FINISHED_STAGES and not lock.locked():
+                self._publish_locks.pop(job.job_id, None)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            request_id_token = set_request_id(job.request_id)
+            try:
+                # Jobs outlive the request that queued them, so they get a budget of their own
+                with request_deadline(ENHANCE_JOB_BUDGET_SECONDS):
+                    result = await run_enhance_pipeline(job.request_data, on_stage=lambda stage: self._set_stage(job, stage))
+                job.pdf_url = result.pdf_url
+                job.improvement_summary = result.improvement_summary
+                job.stage_timings = result.stage_timings
+                job.set_stage("done")
+            except HTTPException as e:
+                job.error = e.detail
+                job.set_stage("failed")
+            except Exception as e:
+                logger.exception("Enhance job failed", extra={"job_id": job.job_id})
+                job.error = f"An unexpected error occurred during resume enhancement: {str(e)}"
+                job.set_stage("failed")
+            finally:
+                # The request body is no longer needed once the job has finished
+                job.request_data = None
+                self._queue.task_done()
+                reset_request_id(request_id_token)
+            await self._publish(job)
+
+
+enhance_job_queue = EnhanceJobQueue(
+    workers=ENHANCE_JOB_WORKERS,
+    max_queue=ENHANCE_JOB_MAX_QUEUE,
+    ttl_seconds=ENHANCE_JOB_TTL_SECONDS,
+    storage=job_storage_from_uri(ENHANCE_JOB_STORAGE_URI),
+)
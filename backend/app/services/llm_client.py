@@ -0,0 +1,204 @@
+# app/services/llm_client.py
+import asyncio
+import hashlib
+import json
+import time
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from ..core.config import (
+    OPENAI_API_KEY,
+    OPENAI_TIMEOUT_SECONDS,
+    OPENAI_CONNECT_TIMEOUT_SECONDS,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    OPENAI_MAX_CONCURRENCY,
+    OPENAI_MAX_RETRIES,
+    LLM_SINGLE_FLIGHT_ENABLED,
+    LLM_HEDGE_ENABLED,
+)
+from ..core.metrics import record_llm_usage, LLM_COALESCED_CALLS
+from .resilience import CircuitBreaker, LatencyTracker, hedged
+from .single_flight import SingleFlight
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Errors that signal an unhealthy or overloaded model: timeouts, connection failures, 429 and 5xx."""
+    import openai
+
+    return isinstance(error, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError))
+
+
+def completion_key(model: str, messages: List[dict], temperature: float, max_tokens: int, response_format: Optional[dict]) -> str:
+    """Hash everything that determines a completion, with message whitespace collapsed."""
+    normalized = [(message["role"], " ".join(message["content"].split())) for message in messages]
+    payload = json.dumps([model, normalized, temperature, max_tokens, response_format], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMClient:
+    """Shared async OpenAI client with a pooled HTTP transport and a concurrency cap.
+
+    Each model has its own circuit breaker, so one failing model does not
+    block its fallback, and its own latency window for choosing when to hedge.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        timeout: float = OPENAI_TIMEOUT_SECONDS,
+        connect_timeout: float = OPENAI_CONNECT_TIMEOUT_SECONDS,
+        max_connections: int = OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections: int = OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        max_concurrency: int = OPENAI_MAX_CONCURRENCY,
+        max_retries: int = OPENAI_MAX_RETRIES,
+        base_url: Optional[str] = None,
+        single_flight: bool = LLM_SINGLE_FLIGHT_ENABLED,
+        hedge: bool = LLM_HEDGE_ENABLED,
+    ):
+        # Imported here so that importing the app does not pay for the OpenAI SDK
+        import httpx
+        import openai
+
+        self._http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+        self._client = openai.AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self._http_client,
+            max_retries=max_retries,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._single_flight = SingleFlight() if single_flight else None
+        self.hedge = hedge
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = self._breakers[model] = CircuitBreaker(f"openai/{model}", f"OpenAI model {model}", is_transient_error)
+        return breaker
+
+    def _latency(self, model: str) -> LatencyTracker:
+        tracker = self._latencies.get(model)
+        if tracker is None:
+            tracker = self._latencies[model] = LatencyTracker()
+        return tracker
+
+    async def chat_completion(
+        self, messages: List[dict], model: str, temperature: float, max_tokens: int,
+        response_format: Optional[dict] = None, timeout: Optional[float] = None,
+    ):
+        """Run a chat completion, waiting for a free slot if the concurrency cap is reached.
+
+        Identical completions requested while one is already in flight share
+        its response instead of making another upstream call. Callers must
+        treat the returned response as read-only. With hedging enabled, a call
+        still running after the model's recent p95 latency is sent a second
+        time and whichever answer arrives first is used. Raises CircuitOpenError
+        (503) without calling OpenAI while the model's circuit is open, and
+        TimeoutError once the upstream call has run for ``timeout`` seconds;
+        that timeout counts once against the model's circuit, however many
+        callers share the call.
+        """
+        if self._single_flight is None:
+            return await self._chat_completion(messages, model, temperature, max_tokens, response_format, timeout)
+        key = f"{completion_key(model, messages, temperature, max_tokens, response_format)}:{timeout}"
+        response, shared = await self._single_flight.do(
+            key, lambda: self._chat_completion(messages, model, temperature, max_tokens, response_format, timeout)
+        )
+        if shared:
+            LLM_COALESCED_CALLS.labels(model).inc()
+        return response
+
+    async def _chat_completion(self, messages: List[dict], model: str, temperature: float, max_tokens: int, response_format: Optional[dict], timeout: Optional[float]):
+        extra = {"response_format": response_format} if response_format else {}
+        latency = self._latency(model)
+
+        async def attempt(_: int):
+            async with self._semaphore:
+                start = time.perf_counter()
+                response = await self._client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **extra,
+                )
+            latency.observe(time.perf_counter() - start)
+            return response
+
+        delay = latency.hedge_delay() if self.hedge else None
+        response = await self.breaker(model).call(lambda: hedged("openai", attempt, delay), timeout=timeout)
+        record_llm_usage(model, response.usage)
+        return response
+
+    async def stream_chat_completion(self, messages: List[dict], model: str, temperature: float, max_tokens: int):
+        """Run a streaming chat completion, yielding content deltas as they arrive.
+
+        Streams are never hedged: the breaker only sees whether the stream opened.
+        """
+        async with self._semaphore:
+            stream = await self.breaker(model).call(lambda: self._client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                # The final chunk then carries token usage, with no choices
+                stream_options={"include_usage": True},
+            ))
+            try:
+                async for chunk in stream:
+                    if chunk.usage is not None:
+                        record_llm_usage(model, chunk.usage)
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                await stream.close()
+
+    async def warm_up(self):
+        """Open a pooled connection to the API ahead of the first completion."""
+        await self._client.models.list()
+
+    async def aclose(self):
+        """Close the underlying connection pool."""
+        await self._client.close()
+
+
+_llm_client: Optional[LLMClient] = None
+
+
+def init_llm_client(**kwargs) -> Optional[LLMClient]:
+    """Create the shared client. Called once from the application lifespan."""
+    global _llm_client
+    if _llm_client is None and OPENAI_API_KEY:
+        _llm_client = LLMClient(api_key=OPENAI_API_KEY, **kwargs)
+    return _llm_client
+
+
+def get_llm_client() -> LLMClient:
+    """Return the shared client, or fail with 503 if it was never initialized."""
+    if _llm_client is None:
+        raise HTTPException(status_code=503, detail="OpenAI client not initialized. API key might be missing or invalid.")
+    return _llm_client
+
+
+def set_llm_client(client: Optional[LLMClient]):
+    """Replace the shared client (used by benchmarks against local stand-ins)."""
+    global _llm_client
+    _llm_client = client
+
+
+async def close_llm_client():
+    """Close the shared client. Called once on application shutdown."""
+    global _llm_client
+    if _llm_client is not None:
+        await _llm_client.aclose()
+        _llm_client = None
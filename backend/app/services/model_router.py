@@ -0,0 +1,112 @@
+# app/services/model_router.py
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, List, NamedTuple, Optional
+
+from ..core.config import MODEL_ROUTES, MODEL_CONTEXT_WINDOWS, DEFAULT_MODEL_CONTEXT_WINDOW
+from ..core.metrics import LLM_CALL_LATENCY, LLM_FALLBACKS
+from .llm_client import get_llm_client, is_transient_error
+from .resilience import CircuitOpenError, call_timeout, deadline_exceeded, deadline_passed
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRoute(NamedTuple):
+    """Models and limits for one LLM stage."""
+
+    primary: str
+    fallback: Optional[str]
+    latency_budget_seconds: float
+    max_tokens: int
+
+
+ROUTES = {stage: ModelRoute(**route) for stage, route in MODEL_ROUTES.items()}
+
+
+def get_route(stage: str) -> ModelRoute:
+    return ROUTES[stage]
+
+
+def prompt_token_budget(stage: str) -> int:
+    """Prompt tokens that fit every model a stage can be routed to, leaving room for its output."""
+    route = get_route(stage)
+    models = [model for model in (route.primary, route.fallback) if model]
+    context_window = min(MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_MODEL_CONTEXT_WINDOW) for model in models)
+    return context_window - route.max_tokens
+
+
+async def _timed_completion(stage: str, model: str, latency_budget: Optional[float], **kwargs):
+    """One chat completion on ``model``, recording its latency and outcome.
+
+    The upstream call is given ``latency_budget`` seconds, and a call that
+    runs over counts against the model's circuit once, inside the client.
+    The caller also stops waiting when the request's deadline runs out and
+    gets a 504; that is the client's own limit, not a sign of an unhealthy
+    model, so it is never counted against the circuit.
+    """
+    client = get_llm_client()
+    deadline_timeout = call_timeout("openai")
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        response = await asyncio.wait_for(
+            client.chat_completion(model=model, timeout=latency_budget, **kwargs), timeout=deadline_timeout
+        )
+        outcome = "ok"
+        return response
+    except asyncio.TimeoutError:
+        if deadline_passed():
+            outcome = "deadline"
+            raise deadline_exceeded("openai") from None
+        outcome = "timeout"
+        raise
+    finally:
+        LLM_CALL_LATENCY.labels(stage, model, outcome).observe(time.perf_counter() - start)
+
+
+async def routed_chat_completion(stage: str, messages: List[dict], temperature: float, response_format: Optional[dict] = None):
+    """Run a stage's chat completion on its primary model, falling back when it is slow or failing.
+
+    The primary call is abandoned once it exceeds the stage's latency budget,
+    when it fails with a transient error, or when its circuit is open, and the
+    completion is retried on the fallback model with whatever is left of the
+    request's deadline. Other errors, including running out of that deadline,
+    and any failure when no fallback is configured, propagate unchanged.
+    """
+    route = get_route(stage)
+    kwargs = {"messages": messages, "temperature": temperature, "max_tokens": route.max_tokens, "response_format": response_format}
+    try:
+        return await _timed_completion(stage, route.primary, route.latency_budget_seconds if route.fallback else None, **kwargs)
+    except asyncio.TimeoutError:
+        reason = "timeout"
+    except CircuitOpenError:
+        if not route.fallback:
+            raise
+        reason = "circuit_open"
+    except Exception as e:
+        if not route.fallback or not is_transient_error(e):
+            raise
+        reason = "error"
+
+    LLM_FALLBACKS.labels(stage, reason).inc()
+    logger.warning(
+        "Falling back from %s to %s for %s", route.primary, route.fallback, stage,
+        extra={"stage": stage, "reason": reason, "latency_budget_seconds": route.latency_budget_seconds}
+    )
+    return await _timed_completion(stage, route.fallback, None, **kwargs)
+
+
+async def routed_stream_chat_completion(stage: str, messages: List[dict], temperature: float) -> AsyncIterator[str]:
+    """Stream a stage's completion from its primary model.
+
+    Streams are not switched to the fallback: text already sent to the client
+    cannot be taken back. Nor are they cut off at the request deadline, but
+    one is not started once the deadline has passed.
+    """
+    route = get_route(stage)
+    call_timeout("openai")
+    async for text in get_llm_client().stream_chat_completion(
+        model=route.primary, messages=messages, temperature=temperature, max_tokens=route.max_tokens
+    ):
+        yield text
@@ -1,36 +1,49 @@
 # app/services/openai_service.py
-import openai
 from fastapi import HTTPException
-from ..core.config import OPENAI_API_KEY
-import traceback
-import os
-
-print("=== Initializing OpenAI Service ===")
-print(f"OpenAI SDK version: {openai.__version__}")
-print(f"OPENAI_API_KEY from environment: {os.getenv('OPENAI_API_KEY')[:10] if os.getenv('OPENAI_API_KEY') else 'Not set'}")
-print(f"OPENAI_API_KEY from config: {OPENAI_API_KEY[:10] if OPENAI_API_KEY else 'Not set'}")
-
-# Initialize OpenAI client
-try:
-    print("Attempting to initialize OpenAI client...")
-    openai.api_key = OPENAI_API_KEY
-    print("OpenAI client initialized successfully")
-except Exception as e:
-    print("=== ERROR INITIALIZING OPENAI CLIENT ===")
-    print(f"Error type: {type(e)}")
-    print(f"Error message: {str(e)}")
-    print("Full traceback:")
-    print(traceback.format_exc())
-    raise HTTPException(status_code=503, detail="OpenAI client not initialized. API key might be missing or invalid.")
-
-def analyze_resume(resume_text: str, job_description_text: str):
-    """Analyze resume against job description using OpenAI."""
-    print("=== Starting analyze_resume ===")
-    if not openai.api_key:
-        print("OpenAI API key is not set")
-        raise HTTPException(status_code=503, detail="OpenAI API key is not set.")
+from typing import Tuple
+from ..core.config import OPENAI_API_KEY, ANALYSIS_OUTPUT_FORMAT
+from ..core.metrics import instrument, record_stage_error
+from .llm_client import get_llm_client
+from .model_router import get_route, prompt_token_budget, routed_chat_completion, routed_stream_chat_completion
+from .prompt_compaction import compact_job_description, compact_resume, count_prompt_tokens
+import logging
 
-    system_prompt = (
+logger = logging.getLogger(__name__)
+
+# Prompt revision used by analyze_resume. Bump the version whenever the analysis
+# prompt changes so cached analyses from the old prompt are not reused.
+ANALYSIS_PROMPT_VERSION = "2"
+
+# Structured output needs a model that supports JSON-schema response formats
+ANALYSIS_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "compatibility_score": {"type": "number"},
+        "improvement_summary": {"type": "string"},
+        "matched_keywords": {"type": "array", "items": {"type": "string"}},
+        "missing_keywords": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["compatibility_score", "improvement_summary", "matched_keywords", "missing_keywords"],
+    "additionalProperties": False
+}
+
+def analysis_cache_identity(output_format: str = ANALYSIS_OUTPUT_FORMAT) -> Tuple[str, str]:
+    """Return the (model, prompt version) pair that identifies an analysis for caching.
+
+    The model is the stage's primary; answers from its fallback are cached
+    under the same identity.
+    """
+    if output_format == "json":
+        return get_route("analyze_json").primary, f"{ANALYSIS_PROMPT_VERSION}-json"
+    return get_route("analyze").primary, ANALYSIS_PROMPT_VERSION
+
+def build_analysis_messages(resume_text: str, job_description_text: str, output_format: str = "text") -> list:
+    """Build the chat messages for a resume analysis.
+
+    ``output_format`` is "text" for the line-based format read by
+    parse_ai_response, or "json" for an object matching ANALYSIS_JSON_SCHEMA.
+    """
+    scoring_prompt = (
         "You are an expert resume analyzer and career coach. "
         "Your task is to analyze a candidate's resume against a provided job description, "
         "with special attention to years of experience requirements. "
@@ -63,6 +76,8 @@ def analyze_resume(resume_text: str, job_description_text: str):
         "   - Maximum 15 points\n"
         "   - Must have specific numbers/metrics\n\n"
         "Calculate the final score by adding all points and converting to a percentage.\n\n"
+    )
+    text_format_prompt = (
         "Provide your analysis in this exact format:\n"
         "Score: [calculated percentage]%\n"
         "Score Breakdown:\n"
@@ -110,7 +125,9 @@ def analyze_resume(resume_text: str, job_description_text: str):
          "Your experience is less than the role requires. If you're confident you can perform the job and meet other criteria, consider applying. Include a strong summary explaining why you're a great fit despite having fewer years of experience. Be aware that experience is often an initial screening factor."
     3. List of matched keywords found in both resume and job description
     4. List of important keywords from job description that are missing in the resume
+    """
 
+    text_format_instructions = """
     Format your response as:
     Score: [percentage]%
     Summary:
@@ -131,36 +148,113 @@ def analyze_resume(resume_text: str, job_description_text: str):
     Ensure your entire response strictly follows this format. Do not add any extra conversational text or introductions beyond the requested sections.
     """
 
+    if output_format == "json":
+        system_prompt = scoring_prompt + (
+            "Return your analysis as a single JSON object with these fields:\n"
+            "- compatibility_score: the calculated percentage as a number between 0 and 100\n"
+            "- improvement_summary: the improvement suggestions as one string, one \"- \" bullet per line\n"
+            "- matched_keywords: array of keywords found in both the resume and the job description\n"
+            "- missing_keywords: array of important job description keywords missing from the resume\n"
+        )
+        user_prompt += """
+    Respond with the JSON object only.
+    """
+    else:
+        system_prompt = scoring_prompt + text_format_prompt
+        user_prompt += text_format_instructions
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+def fit_analysis_resume(resume_text: str, job_description_text: str, output_format: str = "text") -> str:
+    """Compact a resume for analysis, trimming it only if the full prompt would not fit.
+
+    The resume may use whatever the stage's smallest context window leaves
+    after the completion cap, the fixed prompt and the job description.
+    """
+    stage = "analyze_json" if output_format == "json" else "analyze"
+    fixed_tokens = count_prompt_tokens(build_analysis_messages("", job_description_text, output_format))
+    return compact_resume(resume_text, max_tokens=max(0, prompt_token_budget(stage) - fixed_tokens))
+
+@instrument("analyze_resume")
+async def analyze_resume(resume_text: str, job_description_text: str, output_format: str = ANALYSIS_OUTPUT_FORMAT):
+    """Analyze resume against job description using OpenAI.
+
+    Returns the raw completion: the line-based text format, or a JSON object
+    constrained by ANALYSIS_JSON_SCHEMA when ``output_format`` is "json".
+    """
+    if not OPENAI_API_KEY:
+        logger.error("OpenAI API key is not set")
+        raise HTTPException(status_code=503, detail="OpenAI API key is not set.")
+
+    get_llm_client()  # Fail with 503 before doing any work if there is no client
+    job_description_text = compact_job_description(job_description_text)
+    resume_text = fit_analysis_resume(resume_text, job_description_text, output_format)
+
     try:
-        print("Preparing to call OpenAI API...")
-        print(f"Resume text length: {len(resume_text)}")
-        print(f"Job description length: {len(job_description_text)}")
-        
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.1,
-            max_tokens=4095
+        logger.debug(
+            "Calling OpenAI for analysis",
+            extra={"sampled": True, "output_format": output_format, "resume_chars": len(resume_text), "job_description_chars": len(job_description_text)}
         )
-        print("OpenAI API call completed successfully")
+        if output_format == "json":
+            response = await routed_chat_completion(
+                "analyze_json",
+                messages=build_analysis_messages(resume_text, job_description_text, "json"),
+                temperature=0.1,
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {"name": "resume_analysis", "strict": True, "schema": ANALYSIS_JSON_SCHEMA}
+                }
+            )
+        else:
+            response = await routed_chat_completion(
+                "analyze",
+                messages=build_analysis_messages(resume_text, job_description_text),
+                temperature=0.1
+            )
         return response.choices[0].message.content
 
+    except HTTPException:
+        # Open circuits (503) and spent deadlines (504) keep their status
+        raise
     except Exception as e:
-        print("=== ERROR IN OPENAI ANALYSIS ===")
-        print(f"Error type: {type(e)}")
-        print(f"Error message: {str(e)}")
-        print("Full traceback:")
-        print(traceback.format_exc())
+        logger.exception("OpenAI analysis failed")
         raise HTTPException(status_code=500, detail=f"Error analyzing resume: {str(e)}")
 
-def generate_enhanced_resume(resume_text: str, job_description: str, improvement_suggestions: str = None):
-    """Enhance a resume based on a job description using OpenAI."""
-    if not openai.api_key:
+async def stream_analyze_resume(resume_text: str, job_description_text: str):
+    """Stream the analysis of a resume against a job description, yielding text as it arrives."""
+    if not OPENAI_API_KEY:
         raise HTTPException(status_code=503, detail="OpenAI API key is not set.")
 
+    get_llm_client()  # Fail with 503 before doing any work if there is no client
+    job_description_text = compact_job_description(job_description_text)
+    resume_text = fit_analysis_resume(resume_text, job_description_text)
+
+    try:
+        async for text in routed_stream_chat_completion(
+            "analyze",
+            messages=build_analysis_messages(resume_text, job_description_text),
+            temperature=0.1
+        ):
+            yield text
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Streaming OpenAI analysis failed")
+        raise HTTPException(status_code=500, detail=f"Error analyzing resume: {str(e)}")
+
+def build_enhance_messages(resume_text: str, job_description: str, improvement_suggestions: str = None) -> list:
+    """Build the chat messages for enhancing a resume, compacting both inputs first.
+
+    The resume is deduplicated and normalized but never trimmed, since every
+    section left out of the prompt would be left out of the enhanced resume.
+    """
+    resume_text = compact_resume(resume_text)
+    job_description = compact_job_description(job_description)
+
     system_prompt = (
         "You are an expert resume writer with 15+ years of experience helping job seekers optimize their resumes. "
         "Your task is to enhance a candidate's resume to better match a specific job description. "
@@ -256,30 +350,64 @@ def generate_enhanced_resume(resume_text: str, job_description: str, improvement
     Return the enhanced resume in a clear, well-formatted text structure with proper section headers, bullet points, and spacing.
     """
 
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+@instrument("generate_enhanced_resume")
+async def generate_enhanced_resume(resume_text: str, job_description: str, improvement_suggestions: str = None):
+    """Enhance a resume based on a job description using OpenAI."""
+    if not OPENAI_API_KEY:
+        raise HTTPException(status_code=503, detail="OpenAI API key is not set.")
+
+    get_llm_client()  # Fail with 503 before doing any work if there is no client
+    messages = build_enhance_messages(resume_text, job_description, improvement_suggestions)
+
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.1,
-            max_tokens=4000
+        response = await routed_chat_completion(
+            "enhance",
+            messages=messages,
+            temperature=0.1
         )
 
         return response.choices[0].message.content.strip()
     
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("OpenAI resume enhancement failed")
+        raise HTTPException(status_code=500, detail=f"Error enhancing resume: {str(e)}")
+
+async def stream_enhanced_resume(resume_text: str, job_description: str, improvement_suggestions: str = None):
+    """Stream the enhancement of a resume, yielding text as it arrives."""
+    if not OPENAI_API_KEY:
+        raise HTTPException(status_code=503, detail="OpenAI API key is not set.")
+
+    get_llm_client()  # Fail with 503 before doing any work if there is no client
+    messages = build_enhance_messages(resume_text, job_description, improvement_suggestions)
+
+    try:
+        async for text in routed_stream_chat_completion("enhance", messages=messages, temperature=0.1):
+            yield text
+
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error enhancing resume: {e}")
-        print("Full traceback:")
-        print(traceback.format_exc())
+        logger.exception("Streaming OpenAI resume enhancement failed")
         raise HTTPException(status_code=500, detail=f"Error enhancing resume: {str(e)}")
 
-def generate_improvement_summary(original_resume: str, enhanced_resume: str, job_description: str):
+@instrument("generate_improvement_summary")
+async def generate_improvement_summary(original_resume: str, enhanced_resume: str, job_description: str):
     """Generate a summary of improvements made to the resume."""
-    if not openai.api_key:
+    if not OPENAI_API_KEY:
         raise HTTPException(status_code=503, detail="OpenAI API key is not set.")
 
+    # Resumes are never trimmed here: the summary must see every change that was made
+    original_resume = compact_resume(original_resume)
+    enhanced_resume = compact_resume(enhanced_resume)
+    job_description = compact_job_description(job_description)
+
     system_prompt = (
         "You are an expert resume writer with 15+ years of experience helping job seekers optimize their resumes. "
         "Your task is to explain the improvements made to a candidate's resume for a specific job position."
@@ -308,21 +436,21 @@ def generate_improvement_summary(original_resume: str, enhanced_resume: str, job
     Start your response with "## Improvement Summary" and then list the improvements as bullet points.
     """
 
+    get_llm_client()
+
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
+        response = await routed_chat_completion(
+            "summary",
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ],
-            temperature=0.1,
-            max_tokens=1500
+            temperature=0.1
         )
 
         return response.choices[0].message.content
     
     except Exception as e:
-        print(f"Error generating improvement summary: {e}")
-        print("Full traceback:")
-        print(traceback.format_exc())
+        logger.exception("OpenAI improvement summary failed; returning the generic summary")
+        record_stage_error("generate_improvement_summary", e)
         return "## Improvement Summary\n- Enhanced resume to better match job requirements\n- Highlighted relevant skills and experiences\n- Used stronger action verbs\n- Added quantifiable achievements where possible\n- Aligned summary with job description"
\ No newline at end of file
@@ -0,0 +1,112 @@
+# app/services/pdf_renderer.py
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from fastapi import HTTPException
+from ..core.config import PDF_RENDER_WORKERS, PDF_RENDER_MAX_QUEUE
+
+# Per-process state, populated by _init_worker in each pool process
+_worker_html_class = None
+_worker_font_config = None
+
+_WARMUP_HTML = "<html><body><p style=\"font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif\">warm-up</p></body></html>"
+
+
+def _init_worker():
+    """Import WeasyPrint once per worker and warm its font cache."""
+    global _worker_html_class, _worker_font_config
+    from weasyprint import HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    _worker_html_class = HTML
+    _worker_font_config = FontConfiguration()
+    HTML(string=_WARMUP_HTML).write_pdf(font_config=_worker_font_config)
+
+
+def _render_in_worker(html_content: str, output_path: str) -> int:
+    """Render HTML to a PDF file inside a pool process and return its size in bytes."""
+    if _worker_html_class is None:
+        _init_worker()
+    _worker_html_class(string=html_content).write_pdf(output_path, font_config=_worker_font_config)
+    return os.path.getsize(output_path)
+
+
+def _noop():
+    return None
+
+
+class WeasyPrintRenderer:
+    """Local PDF renderer backed by a warm WeasyPrint process pool with a bounded queue."""
+
+    def __init__(self, workers: int = PDF_RENDER_WORKERS, max_queue: int = PDF_RENDER_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    def start(self):
+        """Start the pool and force every worker to initialize."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            for _ in range(self.workers):
+                self._executor.submit(_noop)
+
+    async def render(self, html_content: str, output_path: str) -> int:
+        """Render HTML to output_path without blocking the event loop.
+
+        Raises a 503 HTTPException when the renderer already has
+        ``workers + max_queue`` renders in flight.
+        """
+        if self._executor is None:
+            self.start()
+        if self._pending >= self.workers + self.max_queue:
+            raise HTTPException(status_code=503, detail="PDF renderer is busy. Please try again shortly.")
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, _render_in_worker, html_content, output_path)
+        except BrokenProcessPool:
+            # A worker died (e.g. crashed in a native library); rebuild the pool on the next render
+            self.shutdown()
+            raise
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        """Return worker count and current queue occupancy."""
+        return {"workers": self.workers, "max_queue": self.max_queue, "pending": self._pending}
+
+    def shutdown(self):
+        """Stop the pool, cancelling renders that have not started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pdf_renderer: Optional[WeasyPrintRenderer] = None
+
+
+def init_pdf_renderer() -> WeasyPrintRenderer:
+    """Create and start the shared local renderer. Called from the application lifespan."""
+    global _pdf_renderer
+    if _pdf_renderer is None:
+        _pdf_renderer = WeasyPrintRenderer()
+        _pdf_renderer.start()
+    return _pdf_renderer
+
+
+def get_pdf_renderer() -> WeasyPrintRenderer:
+    """Return the shared local renderer, starting it on first use."""
+    return init_pdf_renderer()
+
+
+def close_pdf_renderer():
+    """Shut down the shared local renderer. Called on application shutdown."""
+    global _pdf_renderer
+    if _pdf_renderer is not None:
+        _pdf_renderer.shutdown()
+        _pdf_renderer = None
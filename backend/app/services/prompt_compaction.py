@@ -0,0 +1,78 @@
+# app/services/prompt_compaction.py
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from ..core.config import PROMPT_COMPACTION_ENABLED, PROMPT_JOB_DESCRIPTION_MAX_TOKENS
+from ..utils.text_compaction import compact_text, count_tokens
+
+logger = logging.getLogger(__name__)
+
+TOKENS_SAVED_HEADER = "X-Prompt-Tokens-Saved"
+
+# Chat formatting tokens added per message, and once to prime the reply
+_TOKENS_PER_MESSAGE = 4
+_TOKENS_PER_REPLY = 3
+
+
+class CompactionStats:
+    """Prompt tokens before and after compaction, summed over one request."""
+
+    __slots__ = ("tokens_before", "tokens_after")
+
+    def __init__(self):
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+# Tasks copy the context they are created in, so concurrent stages and batch
+# items started inside a tracked request all add to the same stats object
+_current_stats: ContextVar[Optional[CompactionStats]] = ContextVar("prompt_compaction_stats", default=None)
+
+
+@contextmanager
+def track_prompt_compaction() -> Iterator[CompactionStats]:
+    """Collect compaction savings for every prompt built inside the block."""
+    stats = CompactionStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _compact(kind: str, text: str, max_tokens: Optional[int], job_posting: bool) -> str:
+    if not PROMPT_COMPACTION_ENABLED or not text:
+        return text
+    compacted, tokens_before, tokens_after = compact_text(text, max_tokens, job_posting)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.tokens_before += tokens_before
+        stats.tokens_after += tokens_after
+    if tokens_before != tokens_after:
+        logger.debug("Compacted %s for prompt", kind, extra={"sampled": True, "tokens_before": tokens_before, "tokens_after": tokens_after})
+    return compacted
+
+
+def compact_job_description(text: str) -> str:
+    """Strip boilerplate, duplicates and extra whitespace, then trim to the job description budget."""
+    return _compact("job description", text, PROMPT_JOB_DESCRIPTION_MAX_TOKENS, job_posting=True)
+
+
+def compact_resume(text: str, max_tokens: Optional[int] = None) -> str:
+    """Strip duplicate paragraphs and extra whitespace, trimming only if ``max_tokens`` is given.
+
+    Resumes for enhancement must be passed whole: anything trimmed here would
+    be missing from the enhanced resume and its PDF.
+    """
+    return _compact("resume", text, max_tokens, job_posting=False)
+
+
+def count_prompt_tokens(messages: List[dict]) -> int:
+    """Tokens a list of chat messages takes up in the model's context."""
+    return sum(count_tokens(message["content"]) + _TOKENS_PER_MESSAGE for message in messages) + _TOKENS_PER_REPLY
@@ -0,0 +1,329 @@
+# app/services/rate_limiter.py
+import asyncio
+import functools
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from fastapi import HTTPException, Request
+
+from ..core.config import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_STORAGE_URI,
+    RATE_LIMIT_COST_BUDGET,
+    RATE_LIMIT_COSTS,
+    RATE_LIMIT_API_KEYS,
+)
+from ..core.metrics import RATE_LIMIT_REJECTIONS
+
+API_KEY_HEADER = "X-API-Key"
+
+_RATE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(?:/|per)\s*(\d+)?\s*(second|minute|hour|day)s?\s*$", re.IGNORECASE)
+_UNIT_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Buckets untouched for this long are full again and can be dropped
+_PRUNE_AGE_SECONDS = 86400
+_PRUNE_INTERVAL = 1000
+
+
+class Rate(NamedTuple):
+    """A bucket holding ``capacity`` tokens that refills completely every ``period`` seconds."""
+
+    capacity: float
+    period: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period
+
+    def scaled(self, factor: float) -> "Rate":
+        return Rate(self.capacity * factor, self.period)
+
+
+def parse_rate(value: str) -> Rate:
+    """Parse "5/minute", "100 per hour" or "10/5 minutes" into a Rate."""
+    match = _RATE_PATTERN.match(value)
+    if match is None:
+        raise ValueError(f"Invalid rate limit {value!r}")
+    amount, multiplier, unit = match.groups()
+    return Rate(float(amount), float(multiplier or 1) * _UNIT_SECONDS[unit.lower()])
+
+
+class BucketCharge(NamedTuple):
+    key: str
+    rate: Rate
+    cost: float
+
+
+def _refill(tokens: float, updated_at: float, rate: Rate, now: float) -> float:
+    return min(rate.capacity, tokens + max(0.0, now - updated_at) * rate.refill_per_second)
+
+
+def _wait_time(levels: List[float], charges: List[BucketCharge]) -> float:
+    """Seconds until every bucket can pay its charge; 0 if all can now, inf if one never can."""
+    wait = 0.0
+    for tokens, charge in zip(levels, charges):
+        if charge.cost > charge.rate.capacity:
+            return math.inf
+        if tokens < charge.cost:
+            wait = max(wait, (charge.cost - tokens) / charge.rate.refill_per_second)
+    return wait
+
+
+class MemoryBucketStorage:
+    """Token buckets in process memory. Only correct with a single worker process."""
+
+    def __init__(self):
+        self._buckets: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._takes = 0
+
+    async def take(self, charges: List[BucketCharge]) -> float:
+        now = time.time()
+        with self._lock:
+            self._takes += 1
+            if self._takes % _PRUNE_INTERVAL == 0:
+                cutoff = now - _PRUNE_AGE_SECONDS
+                self._buckets = {key: state for key, state in self._buckets.items() if state[1] >= cutoff}
+            levels = [
+                _refill(*self._buckets.get(c.key, (c.rate.capacity, now)), c.rate, now)
+                for c in charges
+            ]
+            wait = _wait_time(levels, charges)
+            if wait == 0:
+                for tokens, charge in zip(levels, charges):
+                    self._buckets[charge.key] = (tokens - charge.cost, now)
+            return wait
+
+    async def aclose(self):
+        pass
+
+
+class SQLiteBucketStorage:
+    """Token buckets in a SQLite file, shared by every process on the host.
+
+    Each charge runs in a ``BEGIN IMMEDIATE`` transaction, so SQLite's file
+    lock serializes updates from all workers.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._takes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)")
+            self._connection = connection
+        return self._connection
+
+    def _take(self, charges: List[BucketCharge]) -> float:
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                levels = []
+                for charge in charges:
+                    row = connection.execute("SELECT tokens, updated_at FROM buckets WHERE key = ?", (charge.key,)).fetchone()
+                    levels.append(_refill(*(row or (charge.rate.capacity, now)), charge.rate, now))
+                wait = _wait_time(levels, charges)
+                if wait == 0:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                        [(charge.key, tokens - charge.cost, now) for tokens, charge in zip(levels, charges)]
+                    )
+                self._takes += 1
+                if self._takes % _PRUNE_INTERVAL == 0:
+                    connection.execute("DELETE FROM buckets WHERE updated_at < ?", (now - _PRUNE_AGE_SECONDS,))
+                connection.execute("COMMIT")
+                return wait
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    async def take(self, charges: List[BucketCharge]) -> float:
+        return await asyncio.to_thread(self._take, charges)
+
+    async def aclose(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+# Checks and charges every bucket atomically. KEYS are bucket keys; ARGV holds
+# capacity, refill per second and cost for each key. The server clock is used
+# so instances with skewed clocks agree. Returns the wait time as a string
+# because Lua numbers returned to Redis are truncated to integers.
+_REDIS_TAKE_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local levels = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 3 - 2])
+    local refill = tonumber(ARGV[i * 3 - 1])
+    local cost = tonumber(ARGV[i * 3])
+    if cost > capacity then
+        return 'inf'
+    end
+    local state = redis.call('HMGET', key, 'tokens', 'updated_at')
+    local tokens = tonumber(state[1]) or capacity
+    local updated_at = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill)
+    levels[i] = tokens
+    if tokens < cost then
+        wait = math.max(wait, (cost - tokens) / refill)
+    end
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 3 - 2])
+    local refill = tonumber(ARGV[i * 3 - 1])
+    redis.call('HSET', key, 'tokens', tostring(levels[i] - tonumber(ARGV[i * 3])), 'updated_at', tostring(now))
+    redis.call('PEXPIRE', key, math.ceil(capacity / refill * 1000))
+end
+return '0'
+"""
+
+
+class RedisBucketStorage:
+    """Token buckets in a Redis-compatible server, shared by every instance.
+
+    Requires the ``redis`` package. Buckets are updated by a Lua script, so a
+    charge across several buckets is atomic.
+    """
+
+    def __init__(self, url: str, key_prefix: str = "rate-limit:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_STORAGE_URI points at Redis but the 'redis' package is not installed.") from e
+        self.key_prefix = key_prefix
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(_REDIS_TAKE_SCRIPT)
+
+    async def take(self, charges: List[BucketCharge]) -> float:
+        args = []
+        for charge in charges:
+            args.extend((charge.rate.capacity, charge.rate.refill_per_second, charge.cost))
+        result = await self._script(keys=[self.key_prefix + charge.key for charge in charges], args=args)
+        return float(result)
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+def storage_from_uri(uri: str):
+    """Create bucket storage from "memory://", "sqlite:///path" or "redis://..." URIs."""
+    if uri.startswith("memory://"):
+        return MemoryBucketStorage()
+    if uri.startswith("sqlite:///"):
+        # sqlite:///relative/path or sqlite:////absolute/path
+        return SQLiteBucketStorage(uri[len("sqlite:///"):])
+    if uri.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBucketStorage(uri)
+    raise ValueError(f"Unsupported rate limit storage {uri!r}")
+
+
+class RateLimiter:
+    """Token-bucket rate limiter over shared storage.
+
+    Every limited request is charged against two buckets per client: the
+    endpoint's own request rate, and a budget of LLM cost units shared by all
+    endpoints, where each scope costs ``costs[scope]`` units. Clients are
+    identified by a known ``X-API-Key`` (which also scales their limits by its
+    budget relative to the default) or else by remote address.
+    """
+
+    def __init__(self, storage, cost_budget: str, costs: Dict[str, float], api_keys: Dict[str, str], enabled: bool = True):
+        self.storage = storage
+        self.cost_budget = parse_rate(cost_budget)
+        self.costs = costs
+        self.enabled = enabled
+        # Keys are only kept hashed, and bucket names never contain them
+        self._api_keys = {
+            hashlib.sha256(key.encode("utf-8")).hexdigest(): parse_rate(budget)
+            for key, budget in api_keys.items()
+        }
+
+    def _client(self, request: Request):
+        """Return (client id, quota multiplier) for a request."""
+        api_key = request.headers.get(API_KEY_HEADER)
+        if api_key:
+            key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+            budget = self._api_keys.get(key_hash)
+            if budget is not None:
+                return f"key:{key_hash[:32]}", budget.refill_per_second / self.cost_budget.refill_per_second
+        return f"ip:{request.client.host if request.client else 'unknown'}", 1.0
+
+    async def hit(self, request: Request, scope: str, rate: Optional[Rate] = None, units: float = 1.0):
+        """Charge ``units`` requests to a scope, or raise 429 with Retry-After."""
+        if not self.enabled:
+            return
+        client, multiplier = self._client(request)
+        charges = []
+        if rate is not None:
+            charges.append(BucketCharge(f"{scope}:{client}", rate.scaled(multiplier), units))
+        cost = self.costs.get(scope, 0.0) * units
+        if cost:
+            charges.append(BucketCharge(f"llm-cost:{client}", self.cost_budget.scaled(multiplier), cost))
+        if not charges:
+            return
+
+        wait = await self.storage.take(charges)
+        if wait > 0:
+            RATE_LIMIT_REJECTIONS.labels(scope).inc()
+        if wait == math.inf:
+            raise HTTPException(status_code=429, detail=f"Request for {scope} exceeds the rate limit budget and can never be served. Send fewer items.")
+        if wait > 0:
+            raise HTTPException(
+                status_code=429,
+                detail=f"Rate limit exceeded for {scope}. Retry in {math.ceil(wait)} seconds.",
+                headers={"Retry-After": str(math.ceil(wait))}
+            )
+
+    def limit(self, limit_value: str, scope: Optional[str] = None):
+        """Decorate an endpoint that takes ``request: Request`` with a per-client request rate."""
+        rate = parse_rate(limit_value)
+
+        def decorator(func):
+            name = scope or func.__name__
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request = kwargs.get("request")
+                if request is None:
+                    request = next(arg for arg in args if isinstance(arg, Request))
+                await self.hit(request, name, rate)
+                return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    async def aclose(self):
+        await self.storage.aclose()
+
+
+limiter = RateLimiter(
+    storage=storage_from_uri(RATE_LIMIT_STORAGE_URI),
+    cost_budget=RATE_LIMIT_COST_BUDGET,
+    costs=RATE_LIMIT_COSTS,
+    api_keys=RATE_LIMIT_API_KEYS,
+    enabled=RATE_LIMIT_ENABLED,
+)
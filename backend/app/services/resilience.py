@@ -0,0 +1,256 @@
+# app/services/resilience.py
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+
+from fastapi import HTTPException
+
+from ..core.config import (
+    REQUEST_BUDGET_SECONDS,
+    HEDGE_PERCENTILE,
+    HEDGE_MIN_SAMPLES,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+)
+from ..core.metrics import CIRCUIT_STATE, CIRCUIT_REJECTIONS, HEDGED_CALLS, UPSTREAM_DEADLINE_EXCEEDED
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+
+# Absolute time.monotonic() by which the current request must be answered
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: float) -> Iterator[None]:
+    """Give the calls made inside the block at most ``seconds`` in total.
+
+    Nested deadlines can only shorten the one already in effect.
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left before the current request's deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def deadline_passed() -> bool:
+    remaining = remaining_budget()
+    return remaining is not None and remaining <= 0
+
+
+def deadline_exceeded(upstream: str) -> HTTPException:
+    """Count a call to ``upstream`` lost to the request deadline and build its 504."""
+    UPSTREAM_DEADLINE_EXCEEDED.labels(upstream).inc()
+    return HTTPException(status_code=504, detail="The request ran out of time waiting for an upstream service. Please try again.")
+
+
+def call_timeout(upstream: str, limit: Optional[float] = None) -> Optional[float]:
+    """Timeout for one upstream call: the smaller of ``limit`` and the remaining request budget.
+
+    Raises 504 when the budget is already spent, so no call is started that
+    could not finish in time.
+    """
+    remaining = remaining_budget()
+    if remaining is None:
+        return limit
+    if remaining <= 0:
+        raise deadline_exceeded(upstream)
+    return remaining if limit is None else min(limit, remaining)
+
+
+class LatencyTracker:
+    """Recent successful call latencies of one upstream, for picking a hedge delay."""
+
+    def __init__(self, window: int = 500, min_samples: int = HEDGE_MIN_SAMPLES, percentile: float = HEDGE_PERCENTILE):
+        self._samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.percentile = percentile
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+
+    def hedge_delay(self) -> Optional[float]:
+        """The tracked percentile of recent latencies, or None until there are enough samples."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(self.percentile / 100 * len(ordered)) - 1)]
+
+
+async def hedged(upstream: str, call: Callable[[int], Awaitable[T]], delay: Optional[float]) -> T:
+    """Run ``call(0)``; if it has not finished after ``delay`` seconds, also run ``call(1)``.
+
+    The first attempt to succeed wins and the other is cancelled. An attempt
+    that fails while the other is still running is ignored; if both fail,
+    the first error is raised. Attempts still running when this coroutine is
+    cancelled are cancelled too. With no delay this is a plain ``call(0)``.
+    """
+    if delay is None:
+        return await call(0)
+
+    primary = asyncio.ensure_future(call(0))
+    pending = {primary}
+    first_error: Optional[BaseException] = None
+    try:
+        # Inside the try, so a caller cancelled or timed out while waiting
+        # does not leave the primary attempt running unobserved
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return primary.result()
+
+        hedge = asyncio.ensure_future(call(1))
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    HEDGED_CALLS.labels(upstream, "hedge" if task is hedge else "primary").inc()
+                    return task.result()
+                first_error = first_error or task.exception()
+        raise first_error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class CircuitOpenError(HTTPException):
+    """503 raised without calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Fail fast with 503 while an upstream keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected without reaching the upstream. Once ``reset_seconds``
+    have passed one trial call is let through (half-open): success closes the
+    circuit, failure opens it again. ``is_failure`` decides which exceptions
+    count; anything else, and cancellation, leaves the count unchanged.
+    A ``timeout`` given to ``call`` always counts: a hanging upstream is as
+    unhealthy as a failing one. Pass only upstream latency limits there, and
+    apply per-request deadlines outside the breaker, where running out of
+    them is a cancellation and leaves the count unchanged; otherwise a few
+    clients sending short deadlines could open the circuit for everyone.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        is_failure: Callable[[BaseException], bool],
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = CIRCUIT_RESET_SECONDS,
+    ):
+        self.name = name
+        self.description = description
+        self.is_failure = is_failure
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._state_gauge = CIRCUIT_STATE.labels(name)
+        self._rejections = CIRCUIT_REJECTIONS.labels(name)
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.warning("Circuit for %s is now %s", self.name, state, extra={"upstream": self.name, "circuit_state": state})
+        self.state = state
+        self._state_gauge.set((self.CLOSED, self.HALF_OPEN, self.OPEN).index(state))
+
+    def before_call(self) -> bool:
+        """Admit a call or raise 503. Returns True if the call is the half-open trial."""
+        if self.state == self.CLOSED:
+            return False
+        retry_after = self.opened_at + self.reset_seconds - time.monotonic()
+        if self.state == self.OPEN and retry_after <= 0:
+            self._set_state(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self._rejections.inc()
+        raise CircuitOpenError(
+            status_code=503,
+            detail=f"{self.description} is currently unavailable. Please try again shortly.",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    def record_success(self, trial: bool = False):
+        if trial:
+            self._trial_in_flight = False
+        self.consecutive_failures = 0
+        self._set_state(self.CLOSED)
+
+    def record_failure(self, trial: bool = False):
+        if trial:
+            self._trial_in_flight = False
+        self.consecutive_failures += 1
+        if trial or self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+
+    async def call(self, func: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """Run ``func()`` through the breaker, giving up with TimeoutError after ``timeout`` seconds."""
+        trial = self.before_call()
+        try:
+            result = await asyncio.wait_for(func(), timeout)
+        except asyncio.CancelledError:
+            if trial:
+                self._trial_in_flight = False
+            raise
+        except asyncio.TimeoutError:
+            self.record_failure(trial)
+            raise
+        except Exception as e:
+            if self.is_failure(e):
+                self.record_failure(trial)
+            elif trial:
+                self._trial_in_flight = False
+            raise
+        self.record_success(trial)
+        return result
+
+
+class DeadlineMiddleware:
+    """ASGI middleware giving each request a time budget for its upstream calls.
+
+    The budget is REQUEST_BUDGET_SECONDS, or less if the client sends a
+    smaller X-Request-Timeout in seconds.
+    """
+
+    def __init__(self, app, budget_seconds: float = REQUEST_BUDGET_SECONDS):
+        self.app = app
+        self.budget_seconds = budget_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        budget = self.budget_seconds
+        requested = dict(scope["headers"]).get(REQUEST_TIMEOUT_HEADER.lower().encode("latin-1"))
+        if requested:
+            try:
+                budget = min(budget, max(0.0, float(requested)))
+            except ValueError:
+                pass
+        with request_deadline(budget):
+            await self.app(scope, receive, send)
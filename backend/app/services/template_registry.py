@@ -0,0 +1,61 @@
+# app/services/template_registry.py
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template
+from markupsafe import Markup
+
+from ..core.config import RESUME_TEMPLATES_DIR, RESUME_DEFAULT_LAYOUT
+
+# Selectable resume layouts; each has layouts/<name>.html and styles/<name>.css
+RESUME_LAYOUTS: Tuple[str, ...] = ("modern", "classic")
+
+
+class TemplateRegistry:
+    """Compiled resume layouts and their stylesheets.
+
+    Every layout template is compiled and every stylesheet read once, when the
+    registry is built. Autoescaping is always on, so applicant-supplied text
+    and links are escaped and cannot inject markup into the rendered resume.
+    """
+
+    def __init__(self, directory: str, layouts: Tuple[str, ...] = RESUME_LAYOUTS, default_layout: str = RESUME_DEFAULT_LAYOUT):
+        if default_layout not in layouts:
+            raise ValueError(f"Default resume layout {default_layout!r} is not one of {layouts}")
+        self.directory = directory
+        self.default_layout = default_layout
+        self._environment = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=True,
+            undefined=StrictUndefined,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=False,
+        )
+        self._templates: Dict[str, Template] = {}
+        self._stylesheets: Dict[str, Markup] = {}
+        for name in layouts:
+            self._templates[name] = self._environment.get_template(f"layouts/{name}.html")
+            with open(os.path.join(directory, "styles", f"{name}.css"), "r", encoding="utf-8") as f:
+                # Stylesheets are trusted files, inlined so remote renderers need no extra fetches
+                self._stylesheets[name] = Markup(f.read())
+
+    @property
+    def layouts(self) -> Tuple[str, ...]:
+        return tuple(self._templates)
+
+    def render(self, layout: Optional[str], **context) -> str:
+        """Render a layout (the default when None) with the given context."""
+        name = layout or self.default_layout
+        template = self._templates.get(name)
+        if template is None:
+            raise HTTPException(status_code=400, detail=f"Unknown resume layout '{name}'. Available layouts: {', '.join(self._templates)}")
+        return template.render(stylesheet=self._stylesheets[name], **context)
+
+
+@lru_cache(maxsize=1)
+def get_template_registry() -> TemplateRegistry:
+    """Return the shared registry, compiling the templates on first use."""
+    return TemplateRegistry(RESUME_TEMPLATES_DIR)
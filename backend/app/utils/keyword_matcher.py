@@ -0,0 +1,131 @@
+# app/utils/keyword_matcher.py
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import yaml
+
+from ..core.config import SKILLS_TAXONOMY_PATH
+
+# Characters that continue a token. "+" and "#" are included so that "C" does
+# not match inside "C++" or "C#".
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789+#_")
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and collapse whitespace so multi-word skills match across line breaks."""
+    return " ".join(text.lower().split())
+
+
+class SkillMatcher:
+    """Multi-pattern skill matcher built on an Aho-Corasick automaton.
+
+    The automaton is compiled once from a taxonomy mapping canonical skill
+    names to synonyms. ``find`` scans a text in a single pass and returns the
+    canonical skills it mentions, in order of first appearance. Matches must
+    sit on token boundaries, and overlapping matches resolve to the longest.
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self.canonical_names: List[str] = []
+        # Trie/automaton as parallel arrays: transitions, failure links and
+        # (pattern length, canonical id) outputs per state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, int]]] = [[]]
+
+        for canonical, synonyms in taxonomy.items():
+            canonical_id = len(self.canonical_names)
+            self.canonical_names.append(canonical)
+            for pattern in {_normalize(canonical), *(_normalize(s) for s in synonyms or [])}:
+                if pattern:
+                    self._add_pattern(pattern, canonical_id)
+        self._build_failure_links()
+
+    @classmethod
+    def from_yaml(cls, path: str) -> "SkillMatcher":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(yaml.safe_load(f) or {})
+
+    def _add_pattern(self, pattern: str, canonical_id: int):
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((len(pattern), canonical_id))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = link if link != next_state else 0
+                # Inherit matches that end at the same position via the suffix link
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def find(self, text: str) -> List[str]:
+        """Return canonical skills mentioned in text, in order of first appearance."""
+        normalized = _normalize(text)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        word_chars = _WORD_CHARS
+        length = len(normalized)
+
+        # Longest boundary-respecting match starting at each position
+        best_at_start: Dict[int, Tuple[int, int]] = {}
+        state = 0
+        for index, ch in enumerate(normalized):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not outputs[state]:
+                continue
+            end = index + 1
+            if end < length and normalized[end] in word_chars and ch in word_chars:
+                continue
+            for pattern_length, canonical_id in outputs[state]:
+                start = end - pattern_length
+                if start > 0 and normalized[start - 1] in word_chars and normalized[start] in word_chars:
+                    continue
+                current = best_at_start.get(start)
+                if current is None or pattern_length > current[0]:
+                    best_at_start[start] = (pattern_length, canonical_id)
+
+        # Keep leftmost-longest, non-overlapping matches
+        found: List[str] = []
+        seen = set()
+        covered_until = 0
+        for start in sorted(best_at_start):
+            if start < covered_until:
+                continue
+            pattern_length, canonical_id = best_at_start[start]
+            covered_until = start + pattern_length
+            if canonical_id not in seen:
+                seen.add(canonical_id)
+                found.append(self.canonical_names[canonical_id])
+        return found
+
+    def match(self, resume_text: str, job_description_text: str) -> Tuple[List[str], List[str]]:
+        """Return (matched, missing) job description skills, in job description order."""
+        resume_skills = set(self.find(resume_text))
+        matched: List[str] = []
+        missing: List[str] = []
+        for skill in self.find(job_description_text):
+            (matched if skill in resume_skills else missing).append(skill)
+        return matched, missing
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    """Return the shared matcher, compiling the taxonomy on first use."""
+    return SkillMatcher.from_yaml(SKILLS_TAXONOMY_PATH)
@@ -1,46 +1,177 @@
 # app/utils/response_parser.py
+import logging
 import re
 
+from ..core.metrics import instrument
+from ..models.schemas import AnalysisResponse
+
+logger = logging.getLogger(__name__)
+
+_SCORE_PATTERN = re.compile(r"Score:\s*(\d+(?:\.\d+)?)\s*%")
+
+# Section markers the analysis prompt asks for, in its order; the model may skip or reorder them
+_SECTION_MARKERS = (
+    ("Summary:", "summary"),
+    ("Matched Keywords:", "matched"),
+    ("Missing Keywords:", "missing"),
+)
+
+@instrument("parse_ai_response")
 def parse_ai_response(ai_response_text: str) -> dict:
-    """Parse the structured response from OpenAI."""
-    compatibility_score = 0.0
-    improvement_summary = "Could not parse improvement suggestions from AI response."
+    """Parse the structured response from OpenAI.
+
+    Walks the response once, line by line. Each section runs from its marker
+    to the next marker, whichever section that opens, so a missing or
+    reordered section does not hide the others. Summary lines are kept as
+    written, keyword lines must start with "-".
+    """
+    compatibility_score = None
+    summary_lines = None
     matched_keywords = []
     missing_keywords = []
+    section = None
+    unseen_markers = list(_SECTION_MARKERS)
 
-    # Parse score
-    score_match = re.search(r"Score:\s*(\d+(\.\d+)?)\s*%", ai_response_text)
-    if score_match:
-        try:
-            compatibility_score = float(score_match.group(1))
-        except ValueError:
-            print(f"Warning: Could not convert score '{score_match.group(1)}' to float.")
-    else:
-        print("Warning: Could not find 'Score:' pattern in AI response.")
-
-    # Parse summary
-    summary_parts = ai_response_text.split("Summary:", 1)
-    if len(summary_parts) > 1:
-        summary_text = summary_parts[1].split("Matched Keywords:", 1)[0].strip()
-        bullet_points = [line.strip() for line in summary_text.split('\n') if line.strip().startswith('-') or line.strip()]
-        if bullet_points:
-            improvement_summary = "\n".join(bullet_points)
-        else:
-            improvement_summary = summary_text
+    for line in ai_response_text.split("\n"):
+        if compatibility_score is None and "Score:" in line:
+            score_match = _SCORE_PATTERN.search(line)
+            if score_match:
+                compatibility_score = float(score_match.group(1))
 
-    # Parse matched keywords
-    matched_section = re.search(r"Matched Keywords:(.*?)(?:Missing Keywords:|$)", ai_response_text, re.DOTALL)
-    if matched_section:
-        matched_keywords = [line.strip('- ').strip() for line in matched_section.group(1).split('\n') if line.strip().startswith('-')]
+        # Each marker opens its section once, wherever it appears; the text after
+        # a marker on the same line belongs to the new section
+        while unseen_markers and ":" in line:
+            found = [(line.find(marker), marker, marker_section) for marker, marker_section in unseen_markers]
+            found = [match for match in found if match[0] != -1]
+            if not found:
+                break
+            position, marker, marker_section = min(found)
+            _add_section_line(section, line[:position], summary_lines, matched_keywords, missing_keywords)
+            line = line[position + len(marker):]
+            section = marker_section
+            unseen_markers.remove((marker, marker_section))
+            if section == "summary":
+                summary_lines = []
 
-    # Parse missing keywords
-    missing_section = re.search(r"Missing Keywords:(.*?)$", ai_response_text, re.DOTALL)
-    if missing_section:
-        missing_keywords = [line.strip('- ').strip() for line in missing_section.group(1).split('\n') if line.strip().startswith('-')]
+        _add_section_line(section, line, summary_lines, matched_keywords, missing_keywords)
+
+    if compatibility_score is None:
+        logger.warning("Could not find 'Score:' pattern in AI response")
+        compatibility_score = 0.0
+
+    if summary_lines is None:
+        improvement_summary = "Could not parse improvement suggestions from AI response."
+    else:
+        improvement_summary = "\n".join(summary_lines)
 
     return {
         "compatibility_score": compatibility_score,
         "improvement_summary": improvement_summary.strip(),
         "matched_keywords": matched_keywords,
         "missing_keywords": missing_keywords
-    } 
\ No newline at end of file
+    }
+
+def _add_section_line(section, line: str, summary_lines, matched_keywords: list, missing_keywords: list):
+    if section is None:
+        return
+    line = line.strip()
+    if not line:
+        return
+    if section == "summary":
+        summary_lines.append(line)
+    elif line.startswith("-"):
+        keyword = line.strip("- ").strip()
+        if section == "matched":
+            matched_keywords.append(keyword)
+        else:
+            missing_keywords.append(keyword)
+
+def parse_structured_ai_response(ai_response_json: str) -> dict:
+    """Validate a JSON-mode analysis straight into AnalysisResponse.
+
+    Raises pydantic.ValidationError (a ValueError) if the model output does not
+    match the schema, instead of silently falling back to a zero score.
+    """
+    return AnalysisResponse.model_validate_json(ai_response_json).model_dump()
+
+
+class IncrementalAnalysisParser:
+    """Parse a streamed analysis line by line, emitting fields as soon as they complete.
+
+    Call ``feed`` with each text chunk and ``finish`` once the stream ends. Both
+    return a list of ``(event, data)`` tuples where event is one of
+    ``score``, ``summary_item``, ``matched_keyword`` or ``missing_keyword``.
+    """
+
+    _SCORE_PATTERN = re.compile(r"Score:\s*(\d+(?:\.\d+)?)\s*%")
+    _SECTION_HEADERS = {
+        "score breakdown:": "breakdown",
+        "summary:": "summary",
+        "matched keywords:": "matched",
+        "missing keywords:": "missing",
+    }
+    _SECTION_EVENTS = {
+        "summary": "summary_item",
+        "matched": "matched_keyword",
+        "missing": "missing_keyword",
+    }
+
+    def __init__(self):
+        self._buffer = ""
+        self._section = None
+        self._score_emitted = False
+        self._chunks = []
+
+    @property
+    def text(self) -> str:
+        """Return the full text received so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> list:
+        """Consume a chunk of streamed text and return events for completed lines."""
+        self._chunks.append(chunk)
+        self._buffer += chunk
+        if "\n" not in chunk:
+            return []
+        *lines, self._buffer = self._buffer.split("\n")
+        events = []
+        for line in lines:
+            self._parse_line(line, events)
+        return events
+
+    def finish(self) -> list:
+        """Flush the last partial line and return any remaining events."""
+        events = []
+        if self._buffer:
+            self._parse_line(self._buffer, events)
+            self._buffer = ""
+        return events
+
+    def _parse_line(self, line: str, events: list):
+        line = line.strip()
+        if not line:
+            return
+
+        if not self._score_emitted:
+            score_match = self._SCORE_PATTERN.match(line)
+            if score_match:
+                self._score_emitted = True
+                events.append(("score", float(score_match.group(1))))
+                return
+
+        section = self._SECTION_HEADERS.get(line.lower())
+        if section:
+            self._section = section
+            return
+
+        event = self._SECTION_EVENTS.get(self._section)
+        if event is None:
+            return
+        if self._section == "summary":
+            item = line.lstrip("- ").strip()
+        elif line.startswith("-"):
+            item = line.strip("- ").strip()
+        else:
+            return
+        if item:
+            events.append((event, item))
@@ -0,0 +1,169 @@
+# app/utils/resume_parser.py
+from typing import Dict, List, Optional
+
+SUMMARY_SECTION = "professional summary"
+
+
+class ResumeLine:
+    """One non-empty, stripped line of resume text."""
+
+    __slots__ = ("text", "is_bullet", "is_dash")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.is_bullet = text.startswith("•")
+        self.is_dash = text.startswith("-")
+
+
+class ResumeEntry:
+    """A group of lines opened by a "•" line, e.g. one job, degree or project."""
+
+    __slots__ = ("lines",)
+
+    def __init__(self, first_line: ResumeLine):
+        self.lines: List[ResumeLine] = [first_line]
+
+    @property
+    def title(self) -> str:
+        return self.lines[0].text.lstrip("• ").strip()
+
+    @property
+    def details(self) -> List[ResumeLine]:
+        return self.lines[1:]
+
+
+class ResumeSection:
+    """A titled section with its lines, also grouped into entries."""
+
+    __slots__ = ("name", "lines", "entries")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lines: List[ResumeLine] = []
+        self.entries: List[ResumeEntry] = []
+
+    def add(self, line: ResumeLine):
+        self.lines.append(line)
+        if line.is_bullet or not self.entries:
+            self.entries.append(ResumeEntry(line))
+        else:
+            self.entries[-1].lines.append(line)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(line.text for line in self.lines)
+
+
+class ResumeDocument:
+    """Sections of a resume keyed by lowercase section name."""
+
+    __slots__ = ("sections",)
+
+    def __init__(self):
+        self.sections: Dict[str, ResumeSection] = {}
+
+    def get(self, name: str) -> Optional[ResumeSection]:
+        return self.sections.get(name)
+
+
+def is_section_header(line: str) -> bool:
+    """A header ends with ":" and is not a bullet or dash item."""
+    return line.endswith(":") and not line.startswith("•") and not line.startswith("-")
+
+
+def parse_resume(resume_text: str) -> ResumeDocument:
+    """Tokenize resume text into sections and entries in a single pass.
+
+    Lines before the first header form the professional summary. Sections with
+    no content are dropped, and a repeated section name replaces the earlier one.
+    """
+    document = ResumeDocument()
+    current: Optional[ResumeSection] = None
+
+    for raw_line in resume_text.split("\n"):
+        text = raw_line.strip()
+        if not text:
+            continue
+
+        if is_section_header(text):
+            current = ResumeSection(text.rstrip(":").lower())
+            continue
+
+        if current is None:
+            current = ResumeSection(SUMMARY_SECTION)
+        if not current.lines:
+            # Register on first content so empty sections never appear
+            document.sections[current.name] = current
+        current.add(ResumeLine(text))
+
+    return document
+
+
+class IncrementalResumeParser:
+    """Follow a streamed resume and report each section once it is complete.
+
+    A section is complete when the next section header arrives, or when the
+    stream ends. Call ``feed`` with each text chunk and ``finish`` once the
+    stream ends; both return the names of the sections completed by that text,
+    with the same naming as ``parse_resume``. ``completed_text`` is the text of
+    every completed section, ready to be parsed and rendered on its own.
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._buffer = ""
+        self._offset = 0  # Characters of complete lines consumed so far
+        self._completed_end = 0
+        self._section: Optional[str] = None
+        self._has_content = False
+
+    @property
+    def text(self) -> str:
+        """Return the full text received so far."""
+        return "".join(self._chunks)
+
+    @property
+    def completed_text(self) -> str:
+        return self.text[:self._completed_end]
+
+    def feed(self, chunk: str) -> List[str]:
+        """Consume a chunk of streamed text and return the sections it completed."""
+        self._chunks.append(chunk)
+        self._buffer += chunk
+        if "\n" not in chunk:
+            return []
+        *lines, self._buffer = self._buffer.split("\n")
+        completed = []
+        for line in lines:
+            self._parse_line(line, completed)
+            self._offset += len(line) + 1
+        return completed
+
+    def finish(self) -> List[str]:
+        """Flush the last partial line and complete the final section."""
+        completed = []
+        if self._buffer:
+            self._parse_line(self._buffer, completed)
+            self._offset += len(self._buffer)
+            self._buffer = ""
+        if self._has_content:
+            completed.append(self._section)
+            self._completed_end = self._offset
+            self._has_content = False
+        return completed
+
+    def _parse_line(self, line: str, completed: List[str]):
+        text = line.strip()
+        if not text:
+            return
+        if is_section_header(text):
+            if self._has_content:
+                completed.append(self._section)
+                # Everything before this header belongs to completed sections
+                self._completed_end = self._offset
+            self._section = text.rstrip(":").lower()
+            self._has_content = False
+            return
+        if self._section is None:
+            self._section = SUMMARY_SECTION
+        self._has_content = True
@@ -0,0 +1,214 @@
+# app/utils/text_compaction.py
+import math
+import re
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+
+# Runs of horizontal whitespace after the first non-space character of a line;
+# leading indentation is kept because bullets use it to mark sub-items
+_INNER_SPACE = re.compile(r"(?<=\S)[ \t\u00a0\u2000-\u200a\u202f\u3000]+")
+_INVISIBLE = re.compile(r"[\u200b-\u200d\u2060\ufeff]")
+_BLANK_RUNS = re.compile(r"\n{3,}")
+_TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+
+# Paragraphs pasted from job boards that say nothing about the role itself
+_BOILERPLATE = re.compile(
+    r"equal (?:employment )?opportunity|affirmative action|without regard to|"
+    r"protected veteran|sexual orientation|gender identity|reasonable accommodation|"
+    r"e-verify|pay transparency|privacy (?:notice|policy)|unsolicited (?:resumes|applications)|"
+    r"recruitment agenc|401\(?k\)?|paid time off|\bpto\b|(?:medical|health), dental|"
+    r"competitive (?:salary|pay|compensation) and benefits",
+    re.IGNORECASE
+)
+
+# Section headers matched by substring; a section is as important as its best match.
+# Unmatched sections (and text before the first header) sit in the middle.
+_BOILERPLATE_HEADERS = ("benefit", "perk", "what we offer", "equal opportunity", "eeo", "privacy")
+_LOW_PRIORITY_HEADERS = ("about", "who we are", "company", "culture", "interest", "hobb", "reference", "volunteer")
+_HIGH_PRIORITY_HEADERS = (
+    "requirement", "qualification", "responsibilit", "must have", "what you", "skill", "experience", "summary",
+    "education", "certif"
+)
+
+# Duplicates shorter than this are kept; short repeats are usually terse list items like "Python"
+_MIN_DEDUPE_LENGTH = 20
+
+
+@lru_cache(maxsize=1)
+def _tiktoken_encoding():
+    """The cl100k encoding if tiktoken is installed and usable, else None."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count prompt tokens with tiktoken when available, otherwise estimate them.
+
+    The estimate counts punctuation as one token and words as one token per four
+    characters, which tracks GPT tokenizers closely for English prose.
+    """
+    encoding = _tiktoken_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum(math.ceil(len(piece) / 4) for piece in _TOKEN_PIECES.findall(text))
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse repeated spaces and blank lines, and drop invisible characters."""
+    text = _INVISIBLE.sub("", text.replace("\r\n", "\n").replace("\r", "\n"))
+    lines = [_INNER_SPACE.sub(" ", line).rstrip() for line in text.split("\n")]
+    return _BLANK_RUNS.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _is_header(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped or stripped[0] in "•-*" or len(stripped) > 60:
+        return False
+    return stripped.endswith(":") or stripped.startswith("#") or (stripped.isupper() and any(c.isalpha() for c in stripped))
+
+
+def split_sections(text: str) -> List[Tuple[Optional[str], List[str]]]:
+    """Split text into (header, body lines) pairs. Text before the first header has header None."""
+    sections: List[Tuple[Optional[str], List[str]]] = [(None, [])]
+    for line in text.split("\n"):
+        if _is_header(line):
+            sections.append((line, []))
+        else:
+            sections[-1][1].append(line)
+    if sections[0][1] == [] or all(not line for line in sections[0][1]):
+        sections.pop(0)
+    return sections
+
+
+def _join_sections(sections: List[Tuple[Optional[str], List[str]]]) -> str:
+    lines: List[str] = []
+    for header, body in sections:
+        if header is not None:
+            lines.append(header)
+        lines.extend(body)
+    return _BLANK_RUNS.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _header_matches(header: Optional[str], needles: Tuple[str, ...]) -> bool:
+    if header is None:
+        return False
+    lowered = header.lower()
+    return any(needle in lowered for needle in needles)
+
+
+def section_priority(header: Optional[str]) -> int:
+    """0 for low-value sections, 1 for unknown ones, 2 for sections the prompts depend on."""
+    if _header_matches(header, _HIGH_PRIORITY_HEADERS):
+        return 2
+    if _header_matches(header, _LOW_PRIORITY_HEADERS) or _header_matches(header, _BOILERPLATE_HEADERS):
+        return 0
+    return 1
+
+
+def _is_list_item(line: str) -> bool:
+    stripped = line.lstrip()
+    return bool(stripped) and stripped[0] in "•-*"
+
+
+def _filter_units(sections: List[Tuple[Optional[str], List[str]]], keep: Callable[[str], bool], list_items: bool = True) -> str:
+    """Rebuild text from sections, keeping only units for which keep() is true.
+
+    A unit is one list item, or a whole prose paragraph, since prose statements
+    often span hard-wrapped lines. Headers, and list items when ``list_items``
+    is False, are always kept.
+    """
+    kept_sections = []
+    for header, body in sections:
+        kept_body: List[str] = []
+        paragraph: List[str] = []
+        for line in body + [None]:
+            if line:
+                paragraph.append(line)
+                continue
+            if any(_is_list_item(item) for item in paragraph):
+                kept_body.extend(item for item in paragraph if not list_items or keep(item))
+            elif paragraph and keep("\n".join(paragraph)):
+                kept_body.extend(paragraph)
+            if line is not None:
+                kept_body.append(line)
+            paragraph = []
+        kept_sections.append((header, kept_body))
+    return _join_sections(kept_sections)
+
+
+def strip_boilerplate(text: str) -> str:
+    """Remove benefits/EEO/legal sections, list items and paragraphs.
+
+    Whole sections are dropped when their header names boilerplate; elsewhere
+    matching list items and prose paragraphs are dropped.
+    """
+    sections = [(header, body) for header, body in split_sections(text) if not _header_matches(header, _BOILERPLATE_HEADERS)]
+    return _filter_units(sections, lambda unit: not _BOILERPLATE.search(unit))
+
+
+def remove_duplicate_paragraphs(text: str, list_items: bool = False) -> str:
+    """Keep the first occurrence of each paragraph, ignoring case and spacing.
+
+    With ``list_items`` repeated list items are dropped too. That suits postings
+    pasted twice, but not resumes, where two jobs may share an identical bullet.
+    """
+    seen = set()
+
+    def first_occurrence(unit: str) -> bool:
+        key = " ".join(unit.lstrip(" •-*").lower().split())
+        if len(key) < _MIN_DEDUPE_LENGTH:
+            return True
+        if key in seen:
+            return False
+        seen.add(key)
+        return True
+
+    return _filter_units(split_sections(text), first_occurrence, list_items)
+
+
+def trim_to_token_budget(text: str, max_tokens: int) -> str:
+    """Trim text to at most max_tokens, dropping the least important content first.
+
+    Lines are removed from the end of the lowest-priority section (the latest
+    one on ties) until the text fits, so requirements and experience outlast
+    company blurbs and interests. Headers go only once their section is empty.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    sections = [
+        [section_priority(header), header, body, [count_tokens(line) for line in body]]
+        for header, body in split_sections(text)
+    ]
+    total = sum(sum(costs) + (count_tokens(header) if header else 0) for _, header, _, costs in sections)
+    while total > max_tokens and sections:
+        index = min(range(len(sections)), key=lambda i: (sections[i][0], -i))
+        _, header, body, costs = sections[index]
+        if body:
+            body.pop()
+            total -= costs.pop()
+        else:
+            total -= count_tokens(header) if header else 0
+            sections.pop(index)
+
+    return _join_sections([(header, body) for _, header, body, _ in sections])
+
+
+def compact_text(text: str, max_tokens: Optional[int], job_posting: bool = False) -> Tuple[str, int, int]:
+    """Normalize, dedupe and trim text for a prompt.
+
+    With ``job_posting`` boilerplate is stripped and repeated list items are
+    removed as well. With ``max_tokens`` None nothing is trimmed. Returns
+    (compacted text, tokens before, tokens after).
+    """
+    tokens_before = count_tokens(text)
+    compacted = normalize_whitespace(text)
+    if job_posting:
+        compacted = strip_boilerplate(compacted)
+    compacted = remove_duplicate_paragraphs(compacted, list_items=job_posting)
+    if max_tokens is not None:
+        compacted = trim_to_token_budget(compacted, max_tokens)
+    return compacted, tokens_before, count_tokens(compacted)
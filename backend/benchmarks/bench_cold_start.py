@@ -0,0 +1,93 @@
+"""Benchmark application cold start: module import and lifespan startup.
+
+Each run is a fresh interpreter, as a new worker or autoscaled instance would
+be. The import phase times ``import app.main``; the startup phase then runs
+the lifespan (client construction, taxonomy and template compilation, job
+queue and artifact sweeper start) without serving any request. Upstream API
+keys are set to dummy values so the clients are really constructed, and
+warm-up is off unless --warmup is given. With --top the slowest modules
+from ``python -X importtime`` are listed as well.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_cold_start --runs 10 --top 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def startup():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+started = asyncio.run(startup())
+print(json.dumps({"import": imported - start, "startup": started - imported}))
+"""
+
+
+def _env(warmup: bool) -> dict:
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "sk-bench")
+    env.setdefault("DOCRAPTOR_API_KEY", "bench")
+    env["STARTUP_WARMUP"] = "true" if warmup else "false"
+    env["RATE_LIMIT_STORAGE_URI"] = "memory://"
+    return env
+
+
+def _run_once(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _top_imports(env: dict, count: int):
+    """(cumulative us, module) for the slowest top-level imports under app.main."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nesting depth is encoded by indentation; keep direct children of the root
+        if name.startswith("   ") and not name.startswith("     "):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--warmup", action="store_true", help="also pre-open upstream connections during startup")
+    parser.add_argument("--top", type=int, default=0, help="list the N slowest imports under app.main")
+    args = parser.parse_args()
+
+    env = _env(args.warmup)
+    _run_once(env)  # Populate bytecode caches so every timed run starts alike
+    runs = [_run_once(env) for _ in range(args.runs)]
+    print(f"{'phase':<10}{'median ms':>12}{'min ms':>10}{'max ms':>10}")
+    for phase in ("import", "startup"):
+        values = [run[phase] * 1000 for run in runs]
+        print(f"{phase:<10}{statistics.median(values):>12.1f}{min(values):>10.1f}{max(values):>10.1f}")
+
+    if args.top:
+        print("\nslowest imports under app.main:")
+        for cumulative, name in _top_imports(env, args.top):
+            print(f"{cumulative / 1000:>10.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Measure how /analyze/ scales with concurrent requests.
+
+The OpenAI client is replaced by a stand-in that sleeps for a fixed latency,
+so N concurrent requests should finish in roughly the time of one.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_concurrent_analyze --requests 10 --latency 1.0
+"""
+import os
+
+# Settings are read at import time, so these must be set before the app is imported
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+
+from app.main import app
+from app.services.rate_limiter import limiter
+from app.services.llm_client import set_llm_client
+
+SAMPLE_RESPONSE = (
+    "Score: 72%\n"
+    "Summary:\n"
+    "- Highlight Kubernetes experience\n"
+    "- Quantify achievements\n\n"
+    "Matched Keywords:\n"
+    "- Python\n"
+    "- FastAPI\n\n"
+    "Missing Keywords:\n"
+    "- Kubernetes\n"
+)
+
+
+class SleepingLLMClient:
+    """Stand-in for LLMClient that simulates a slow completion without blocking the loop."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def chat_completion(self, messages, model, temperature, max_tokens, response_format=None):
+        await asyncio.sleep(self.latency)
+        message = SimpleNamespace(content=SAMPLE_RESPONSE)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def aclose(self):
+        pass
+
+
+async def run(num_requests: int, latency: float):
+    set_llm_client(SleepingLLMClient(latency))
+    limiter.enabled = False
+
+    payload = {"resume_text": "Python developer", "job_description_text": "Python, Kubernetes"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.post("/analyze/", json=payload) for _ in range(num_requests)))
+        elapsed = time.perf_counter() - start
+
+    failures = sum(1 for r in responses if r.status_code != 200)
+    print(f"requests={num_requests} latency={latency:.2f}s elapsed={elapsed:.2f}s failures={failures}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.latency))
+
+
+if __name__ == "__main__":
+    main()
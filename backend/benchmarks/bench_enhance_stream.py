@@ -0,0 +1,178 @@
+"""Compare when users first see their enhanced resume: blocking versus streamed enhance.
+
+``--requests`` sequential enhancements are sent to /enhance-resume/ and to
+/enhance-resume/stream/ against fake OpenAI and DocRaptor servers whose
+completions are paced at ``--tokens-per-second``. For the blocking endpoint
+the first thing a user sees is the finished response; for the streamed one
+it is the first token and then the first rendered section (the Professional
+Summary), long before the full document and PDF are ready.
+
+httpx's ASGITransport buffers whole responses, so streamed requests are
+sent to the app as raw ASGI calls to see each chunk when it is sent.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_enhance_stream --requests 10 --tokens-per-second 200
+"""
+import os
+
+# Settings are read at import time, so these must be set before the app is imported
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ.setdefault("DOCRAPTOR_API_KEY", "bench")
+os.environ.setdefault("PDF_RENDER_BACKEND", "docraptor")
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+
+import argparse
+import asyncio
+import json
+import time
+from typing import AsyncIterator
+
+import httpx
+
+from app.main import app
+from app.services.docraptor_client import DocRaptorClient, close_docraptor_client, set_docraptor_client
+from app.services.llm_client import LLMClient, close_llm_client, set_llm_client
+from app.services.rate_limiter import limiter
+
+from .bench_prompt_compaction import POSTING
+from .bench_resume_html import realistic_resume
+from .fake_upstreams import FakeServer, UpstreamBehavior, create_fake_docraptor_app, create_fake_openai_app
+from .results import latency_summary, save_results
+
+
+def _body(index: int) -> dict:
+    return {
+        "resume_text": realistic_resume(5),
+        "job_description_text": POSTING,
+        "applicant_name": f"Stream Bench {index}",
+        "contact_info": "bench@example.com | 555-0100 | Springfield",
+    }
+
+
+async def stream_lines(path: str, body: dict) -> AsyncIterator[str]:
+    """POST JSON to the app over raw ASGI and yield response lines as they are sent."""
+    chunks: asyncio.Queue = asyncio.Queue()
+    finished = asyncio.Event()
+    payload = json.dumps(body).encode("utf-8")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode("ascii"), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"{path} returned {message['status']}")
+        if message["type"] == "http.response.body":
+            await chunks.put(message.get("body", b""))
+            if not message.get("more_body"):
+                await chunks.put(None)
+
+    call = asyncio.ensure_future(app(scope, receive, send))
+    buffer = b""
+    try:
+        while True:
+            chunk = await chunks.get()
+            if chunk is None:
+                break
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                yield line.decode("utf-8")
+        await call
+    finally:
+        finished.set()
+        if not call.done():
+            call.cancel()
+
+
+async def blocking(client: httpx.AsyncClient, requests: int) -> dict:
+    latencies = []
+    for index in range(requests):
+        start = time.perf_counter()
+        response = await client.post("/enhance-resume/", json=_body(index))
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return {"complete": latency_summary(latencies)}
+
+
+async def streamed(requests: int) -> dict:
+    timings = {"first_token": [], "first_section": [], "complete": []}
+    sections = 0
+    for index in range(requests):
+        start = time.perf_counter()
+        seen = set()
+        async for line in stream_lines("/enhance-resume/stream/", _body(index)):
+            event = json.loads(line)["event"]
+            if event == "error":
+                raise RuntimeError(line)
+            milestone = {"token": "first_token", "section": "first_section"}.get(event)
+            if milestone and milestone not in seen:
+                seen.add(milestone)
+                timings[milestone].append(time.perf_counter() - start)
+            sections += event == "section"
+        timings["complete"].append(time.perf_counter() - start)
+    return {**{name: latency_summary(values) for name, values in timings.items()}, "sections_per_request": sections / requests}
+
+
+async def run(args) -> dict:
+    limiter.enabled = False
+    behavior = UpstreamBehavior(latency=args.llm_latency, tokens_per_second=args.tokens_per_second)
+    openai_server = FakeServer(create_fake_openai_app(behavior)).start()
+    docraptor_server = FakeServer(create_fake_docraptor_app(UpstreamBehavior(latency=args.pdf_latency))).start()
+    try:
+        async with app.router.lifespan_context(app):
+            await close_llm_client()
+            await close_docraptor_client()
+            set_llm_client(LLMClient(api_key="sk-bench", base_url=f"{openai_server.url}/v1"))
+            set_docraptor_client(DocRaptorClient(api_key="bench", url=f"{docraptor_server.url}/docs"))
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                results = {"blocking": await blocking(client, args.requests)}
+            results["streamed"] = await streamed(args.requests)
+            await close_llm_client()
+            await close_docraptor_client()
+    finally:
+        openai_server.stop()
+        docraptor_server.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--pdf-latency", type=float, default=0.5)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"{'mode':<10}{'milestone':<15}{'p50 ms':>10}{'p95 ms':>10}")
+    for mode, milestones in results.items():
+        for milestone, summary in milestones.items():
+            if isinstance(summary, dict):
+                print(f"{mode:<10}{milestone:<15}{summary['p50_ms']:>10.1f}{summary['p95_ms']:>10.1f}")
+    print(f"sections per streamed request: {results['streamed']['sections_per_request']:.1f}")
+    # Flatten to one case per mode and milestone so compare_results can gate on it
+    flat = {f"{mode}_{milestone}": summary for mode, milestones in results.items() for milestone, summary in milestones.items() if isinstance(summary, dict)}
+    save_results(
+        args.output, "enhance_stream",
+        {"requests": args.requests, "llm_latency": args.llm_latency,
+         "tokens_per_second": args.tokens_per_second, "pdf_latency": args.pdf_latency},
+        flat,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark the local skill matcher on realistic and very large inputs.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_keyword_matcher --repeat 20
+"""
+import argparse
+import random
+import time
+
+from app.utils.keyword_matcher import get_skill_matcher
+
+from .results import time_per_call
+
+RESUME_PARAGRAPH = (
+    "Senior software engineer with 7 years of experience building REST APIs in Python and Go lang. "
+    "Led migration of a monolith to microservices on Kubernetes (k8s) and AWS, cutting deploy time by 60%. "
+    "Built React.js and TypeScript front ends, PostgreSQL and Redis data layers, and CI/CD with GitHub Actions. "
+)
+JOB_PARAGRAPH = (
+    "We are hiring a backend engineer. Requirements: Python, FastAPI or Django, PostgreSQL, Docker, "
+    "Kubernetes, Terraform, GCP or Azure, Apache Kafka, observability with Prometheus and Grafana. "
+    "Nice to have: machine learning, NLP, Rust, GraphQL. Equal opportunity employer. "
+)
+FILLER_WORDS = ["the", "and", "team", "delivered", "customers", "platform", "c", "go", "rest", "scalable", "c+", "net"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    get_skill_matcher.cache_clear()
+    matcher = get_skill_matcher()
+    print(f"compile: {(time.perf_counter() - start) * 1000:.2f} ms for {len(matcher.canonical_names)} skills")
+
+    random.seed(0)
+    adversarial = " ".join(random.choice(FILLER_WORDS) for _ in range(200_000))
+    cases = {
+        "realistic": (RESUME_PARAGRAPH * 3, JOB_PARAGRAPH * 2),
+        "large (~1 MB each)": (RESUME_PARAGRAPH * 3000, JOB_PARAGRAPH * 3000),
+        "adversarial near-misses": (adversarial, adversarial),
+    }
+    for name, (resume_text, job_description_text) in cases.items():
+        seconds = time_per_call(lambda: matcher.match(resume_text, job_description_text), args.repeat)
+        total_chars = len(resume_text) + len(job_description_text)
+        print(f"{name}: {seconds * 1000:.3f} ms per match, {total_chars / seconds / 1e6:.1f} M chars/s")
+
+
+if __name__ == "__main__":
+    main()
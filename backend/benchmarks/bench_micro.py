@@ -0,0 +1,61 @@
+"""Micro-benchmarks of parse_ai_response and create_resume_html, saved as JSON.
+
+Each case is run in ``--rounds`` rounds of calls; the per-call time of every
+round is recorded and the median, best and p95 rounds are reported. Inputs
+are a realistic analysis and resume, and very large ones that stress scaling.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_micro --rounds 20 --output results/micro.json
+"""
+import argparse
+
+from app.services.pdf_service import create_resume_html
+from app.services.template_registry import get_template_registry
+from app.utils.response_parser import parse_ai_response
+
+from .bench_resume_html import realistic_resume
+from .bench_response_parser import REALISTIC_RESPONSE, _large_response
+from .results import measure, save_results
+
+CONTACT_INFO = "jane@example.com | 555-0100 | Springfield"
+LINKS = ("https://github.com/jane", "https://linkedin.com/in/jane", "https://jane.dev")
+
+
+def _render(resume_text: str):
+    return lambda: create_resume_html(resume_text, "Jane Doe", CONTACT_INFO, *LINKS)
+
+
+def _cases():
+    """name -> (callable, input size in chars, calls per round)."""
+    large_response = _large_response(20_000)
+    large_resume = realistic_resume(2_000)
+    small_resume = realistic_resume(5)
+    return {
+        "parse_ai_response/realistic": (lambda: parse_ai_response(REALISTIC_RESPONSE), len(REALISTIC_RESPONSE), 500),
+        "parse_ai_response/large": (lambda: parse_ai_response(large_response), len(large_response), 5),
+        "create_resume_html/realistic": (_render(small_resume), len(small_resume), 200),
+        "create_resume_html/large": (_render(large_resume), len(large_resume), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+    get_template_registry()  # Compile templates outside the timed rounds, as startup does
+
+    results = {}
+    print(f"{'case':<32}{'chars':>10}{'median us':>14}{'min us':>14}{'p95 us':>14}")
+    for name, (func, size, calls) in _cases().items():
+        if args.filter not in name:
+            continue
+        result = {"input_chars": size, **measure(func, calls, args.rounds)}
+        results[name] = result
+        print(f"{name:<32}{size:>10}{result['median_us']:>14.1f}{result['min_us']:>14.1f}{result['p95_us']:>14.1f}")
+    save_results(args.output, "micro", {"rounds": args.rounds, "filter": args.filter}, results)
+
+
+if __name__ == "__main__":
+    main()
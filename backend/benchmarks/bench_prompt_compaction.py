@@ -0,0 +1,68 @@
+"""Measure prompt tokens saved by input compaction, and what compaction costs.
+
+Builds a job description padded the way pasted postings usually are
+(boilerplate, benefits, duplicated paragraphs, repeated whitespace) and a
+resume, then reports tokens before and after compaction and the time taken.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_prompt_compaction --copies 3 --repeat 50
+"""
+import argparse
+
+from app.core.config import PROMPT_JOB_DESCRIPTION_MAX_TOKENS
+from app.services.model_router import prompt_token_budget
+from app.utils.text_compaction import compact_text
+
+from .bench_resume_html import realistic_resume
+from .results import time_per_call
+
+POSTING = """Senior Backend Engineer  (Remote)
+
+About Us:
+Acme builds developer tools used by thousands of teams.   We are growing fast and care deeply about our culture.
+
+Responsibilities:
+- Design, build and operate Python services on AWS
+- Own APIs end to end, from schema design to on-call
+- Mentor engineers and review designs
+
+Requirements:
+- 5+ years of backend development in Python
+- Experience with FastAPI or Django, PostgreSQL and Redis
+- Familiarity with Kubernetes and Terraform
+
+Benefits:
+- Medical, dental and vision insurance
+- 401(k) matching and unlimited PTO
+- Home office stipend
+
+Acme is an equal opportunity employer. All qualified applicants will receive consideration for
+employment without regard to race, color, religion, sex, sexual orientation, gender identity,
+national origin, disability or protected veteran status.
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=3, help="times the posting is pasted (duplicated paragraphs)")
+    parser.add_argument("--jobs", type=int, default=40, help="work experience entries in the resume")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    inputs = {
+        "job description": (POSTING.replace(" ", "  ") + "\n\n\n") * args.copies,
+        "resume": realistic_resume(args.jobs),
+    }
+    # Resumes are only trimmed for analysis, and only past what the prompt can hold
+    budgets = {"job description": PROMPT_JOB_DESCRIPTION_MAX_TOKENS, "resume": prompt_token_budget("analyze")}
+
+    print(f"{'input':<18}{'tokens before':>15}{'tokens after':>14}{'saved':>8}{'ms':>9}")
+    for name, text in inputs.items():
+        job_posting = name == "job description"
+        _, tokens_before, tokens_after = compact_text(text, budgets[name], job_posting)
+        seconds = time_per_call(lambda: compact_text(text, budgets[name], job_posting), args.repeat)
+        print(f"{name:<18}{tokens_before:>15}{tokens_after:>14}{tokens_before - tokens_after:>8}{seconds * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
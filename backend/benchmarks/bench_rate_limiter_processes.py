@@ -0,0 +1,100 @@
+"""Verify that rate limits hold across processes, and measure the cost of a check.
+
+Starts several processes that each hammer the same client's bucket through
+RateLimiter.hit. With shared storage the total number of allowed requests
+must equal the bucket capacity no matter how many processes there are; with
+per-process memory storage it is capacity times the process count, which is
+the problem shared storage fixes. Exits non-zero if the shared limit leaks.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_rate_limiter_processes --processes 4 --attempts 200 --capacity 50
+    python -m benchmarks.bench_rate_limiter_processes --storage redis://localhost:6379/15
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.services.rate_limiter import RateLimiter, parse_rate, storage_from_uri
+
+SCOPE = "analyze"
+
+
+def _request(api_key: str = None) -> Request:
+    headers = [(b"x-api-key", api_key.encode())] if api_key else []
+    return Request({"type": "http", "method": "POST", "path": "/analyze/", "headers": headers, "client": ("203.0.113.7", 4321)})
+
+
+async def _hammer(storage_uri: str, capacity: int, attempts: int, start_at: float):
+    # One cost unit per request and an hour-long period, so refill during the run is negligible
+    limiter = RateLimiter(
+        storage=storage_from_uri(storage_uri),
+        cost_budget=f"{capacity * 10}/hour",
+        costs={SCOPE: 1.0},
+        api_keys={},
+    )
+    rate = parse_rate(f"{capacity}/hour")
+    while time.time() < start_at:
+        await asyncio.sleep(0.001)
+
+    allowed = 0
+    latencies = []
+    for _ in range(attempts):
+        started = time.perf_counter()
+        try:
+            await limiter.hit(_request(), SCOPE, rate)
+            allowed += 1
+        except HTTPException as e:
+            if e.status_code != 429:
+                raise
+        latencies.append(time.perf_counter() - started)
+    await limiter.aclose()
+    return allowed, latencies
+
+
+def _worker(args):
+    return asyncio.run(_hammer(*args))
+
+
+def run(storage_uri: str, processes: int, attempts: int, capacity: int):
+    start_at = time.time() + 1.0
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        results = pool.map(_worker, [(storage_uri, capacity, attempts, start_at)] * processes)
+    allowed = sum(count for count, _ in results)
+    latencies = sorted(latency for _, samples in results for latency in samples)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{storage_uri.split(':')[0]:<8} processes={processes} attempts={processes * attempts} "
+          f"allowed={allowed} capacity={capacity} p50={p50:.2f}ms p99={p99:.2f}ms")
+    return allowed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--attempts", type=int, default=200, help="requests per process")
+    parser.add_argument("--capacity", type=int, default=50)
+    parser.add_argument("--storage", default=None, help="shared storage URI (default: a fresh SQLite file)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        shared_uri = args.storage or "sqlite:///" + os.path.join(directory, "buckets.db")
+        shared_allowed = run(shared_uri, args.processes, args.attempts, args.capacity)
+        run("memory://", args.processes, args.attempts, args.capacity)
+
+    # Allow one extra token for refill during the run
+    if not args.capacity <= shared_allowed <= args.capacity + 1:
+        print(f"FAIL: shared storage allowed {shared_allowed} requests for a capacity of {args.capacity}")
+        sys.exit(1)
+    print("OK: the shared limit held across processes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Measure hedged completions against a long-tailed upstream, and fail-fast during an outage.
+
+hedging: ``--calls`` sequential chat completions against a fake OpenAI server
+where ``--stall-rate`` of requests stall for ``--stall-latency`` seconds,
+once plain and once hedged at the p95 of the preceding calls. Hedging should
+cut the tail latency for a small share of extra upstream requests.
+
+outage: ``--requests`` sequential /analyze/ calls against a fake OpenAI
+server that fails every request. Once both models' circuits open, requests
+should be answered with 503 without reaching the upstream at all.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_resilience --calls 200 --stall-rate 0.05 --requests 30
+"""
+import os
+
+# Settings are read at import time, so these must be set before the app is imported
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+
+from app.main import app
+from app.services.llm_client import LLMClient, close_llm_client, set_llm_client
+from app.services.rate_limiter import limiter
+
+from .bench_prompt_compaction import POSTING
+from .bench_resume_html import realistic_resume
+from .fake_upstreams import FakeServer, UpstreamBehavior, create_fake_openai_app
+from .results import latency_summary, save_results
+
+
+async def hedging(args) -> dict:
+    behavior = UpstreamBehavior(latency=args.llm_latency, jitter=args.llm_latency / 2, stall_rate=args.stall_rate, stall_latency=args.stall_latency)
+    results = {}
+    for hedge in (False, True):
+        server = FakeServer(create_fake_openai_app(behavior, seed=7)).start()
+        client = LLMClient(api_key="sk-bench", base_url=f"{server.url}/v1", single_flight=False, hedge=hedge, max_retries=0)
+        try:
+            latencies = []
+            for i in range(args.calls):
+                messages = [{"role": "system", "content": "Benchmark call."}, {"role": "user", "content": f"Call {i}"}]
+                start = time.perf_counter()
+                await client.chat_completion(messages=messages, model="gpt-4", temperature=0.1, max_tokens=100)
+                latencies.append(time.perf_counter() - start)
+            results["hedged" if hedge else "plain"] = {
+                "calls": args.calls,
+                "upstream_calls": server.app.state.injector.requests,
+                **latency_summary(latencies),
+            }
+        finally:
+            await client.aclose()
+            server.stop()
+    return results
+
+
+async def outage(args) -> dict:
+    server = FakeServer(create_fake_openai_app(UpstreamBehavior(latency=args.llm_latency, failure_rate=1.0))).start()
+    payload = {"resume_text": realistic_resume(5), "job_description_text": POSTING}
+    statuses = Counter()
+    latencies = []
+    try:
+        await close_llm_client()
+        set_llm_client(LLMClient(api_key="sk-bench", base_url=f"{server.url}/v1", max_retries=0))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                response = await client.post("/analyze/", json=payload, headers={"X-Cache-Bypass": "true"})
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] += 1
+    finally:
+        await close_llm_client()
+        server.stop()
+    fail_fast = latencies[-statuses[503]:] if statuses[503] else []
+    return {
+        "outage": {
+            "requests": args.requests,
+            "upstream_calls": server.app.state.injector.requests,
+            "status_counts": {str(status): count for status, count in sorted(statuses.items())},
+            **latency_summary(latencies),
+            "fail_fast_p50_ms": latency_summary(fail_fast)["p50_ms"] if fail_fast else None,
+        }
+    }
+
+
+async def run(args) -> dict:
+    limiter.enabled = False
+    async with app.router.lifespan_context(app):
+        results = await hedging(args)
+        results.update(await outage(args))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    parser.add_argument("--stall-latency", type=float, default=1.0)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"{'case':<10}{'calls':>8}{'upstream':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for case, result in results.items():
+        calls = result.get("calls", result.get("requests"))
+        print(f"{case:<10}{calls:>8}{result['upstream_calls']:>10}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}")
+    print(f"outage status counts: {results['outage']['status_counts']}")
+    save_results(
+        args.output, "resilience",
+        {"calls": args.calls, "requests": args.requests, "llm_latency": args.llm_latency,
+         "stall_rate": args.stall_rate, "stall_latency": args.stall_latency},
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark analysis response parsing: legacy regex, single-pass text and JSON paths.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_response_parser --repeat 200
+"""
+import argparse
+import json
+import re
+
+from app.utils.response_parser import parse_ai_response, parse_structured_ai_response
+
+from .results import time_per_call
+
+REALISTIC_RESPONSE = (
+    "Score: 78%\n"
+    "Score Breakdown:\n"
+    "- Required Skills: 20/25 points\n"
+    "- Preferred Skills: 9/15 points\n"
+    "- Experience Years: 15/15 points\n"
+    "- Role Level: 10/15 points\n"
+    "- Education: 15/15 points\n"
+    "- Achievements: 9/15 points\n\n"
+    "Summary:\n"
+    "- Add Kubernetes and Terraform experience to the skills section\n"
+    "- Quantify the impact of the API migration project\n"
+    "- Mention on-call and incident response ownership\n"
+    "- Move the cloud certification closer to the top\n"
+    "- Rephrase the summary around platform engineering\n\n"
+    "Matched Keywords:\n"
+    "- Python\n- FastAPI\n- PostgreSQL\n- Docker\n- AWS\n\n"
+    "Missing Keywords:\n"
+    "- Kubernetes\n- Terraform\n- Kafka\n"
+)
+
+
+def legacy_parse_ai_response(ai_response_text: str) -> dict:
+    """The original regex/split implementation, kept here for comparison."""
+    compatibility_score = 0.0
+    improvement_summary = "Could not parse improvement suggestions from AI response."
+    matched_keywords = []
+    missing_keywords = []
+    score_match = re.search(r"Score:\s*(\d+(\.\d+)?)\s*%", ai_response_text)
+    if score_match:
+        compatibility_score = float(score_match.group(1))
+    summary_parts = ai_response_text.split("Summary:", 1)
+    if len(summary_parts) > 1:
+        summary_text = summary_parts[1].split("Matched Keywords:", 1)[0].strip()
+        bullet_points = [line.strip() for line in summary_text.split('\n') if line.strip().startswith('-') or line.strip()]
+        improvement_summary = "\n".join(bullet_points) if bullet_points else summary_text
+    matched_section = re.search(r"Matched Keywords:(.*?)(?:Missing Keywords:|$)", ai_response_text, re.DOTALL)
+    if matched_section:
+        matched_keywords = [line.strip('- ').strip() for line in matched_section.group(1).split('\n') if line.strip().startswith('-')]
+    missing_section = re.search(r"Missing Keywords:(.*?)$", ai_response_text, re.DOTALL)
+    if missing_section:
+        missing_keywords = [line.strip('- ').strip() for line in missing_section.group(1).split('\n') if line.strip().startswith('-')]
+    return {
+        "compatibility_score": compatibility_score,
+        "improvement_summary": improvement_summary.strip(),
+        "matched_keywords": matched_keywords,
+        "missing_keywords": missing_keywords
+    }
+
+
+def _large_response(keywords: int) -> str:
+    summary = "".join(f"- Suggestion number {i} about a specific part of the resume\n" for i in range(keywords // 10))
+    matched = "".join(f"- matched-keyword-{i}\n" for i in range(keywords))
+    missing = "".join(f"- missing-keyword-{i}\n" for i in range(keywords))
+    return f"Score: 64%\nSummary:\n{summary}\nMatched Keywords:\n{matched}\nMissing Keywords:\n{missing}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    cases = {"realistic": REALISTIC_RESPONSE, "large (20k keywords)": _large_response(20_000)}
+    for name, text in cases.items():
+        assert legacy_parse_ai_response(text) == parse_ai_response(text)
+        as_json = json.dumps(parse_ai_response(text))
+        repeat = args.repeat if len(text) < 10_000 else max(1, args.repeat // 50)
+        legacy = time_per_call(lambda: legacy_parse_ai_response(text), repeat)
+        single_pass = time_per_call(lambda: parse_ai_response(text), repeat)
+        structured = time_per_call(lambda: parse_structured_ai_response(as_json), repeat)
+        print(
+            f"{name} ({len(text)} chars): legacy regex {legacy * 1e6:.1f} us, "
+            f"single-pass text {single_pass * 1e6:.1f} us, structured JSON {structured * 1e6:.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
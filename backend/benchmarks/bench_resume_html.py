@@ -0,0 +1,91 @@
+"""Benchmark resume parsing and HTML building on large and adversarial inputs.
+
+The renderer should scale linearly with resume size. Each case is timed at a
+base size and at ``--scale`` times that size; the ratio of per-line costs
+should stay close to 1.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_resume_html --scale 10 --repeat 5
+"""
+import argparse
+
+from app.services.pdf_service import create_resume_html
+from app.services.template_registry import get_template_registry
+from app.utils.resume_parser import parse_resume
+
+from .results import time_per_call
+
+
+def _experience(jobs: int) -> str:
+    blocks = []
+    for i in range(jobs):
+        blocks.append(
+            f"• Senior Engineer {i} (Remote, 2018-2020)\n"
+            f"Company {i}\n"
+            "Jan 2018 - Dec 2020\n"
+            "  - Reduced p95 latency by 40% across the ingestion pipeline\n"
+            "  - Led a team of five engineers through a platform migration\n"
+        )
+    return "Work Experience:\n" + "".join(blocks)
+
+
+def realistic_resume(jobs: int) -> str:
+    return (
+        "Experienced backend engineer focused on distributed systems.\n"
+        + _experience(jobs)
+        + "Education:\n• BSc Computer Science\nState University\n2016\n"
+        + "Skills:\n• Languages: Python, Go, Rust\n• Cloud: AWS, GCP\n- Docker\n"
+        + "Languages:\n• English, Spanish\n"
+    )
+
+
+def skill_continuations(lines: int) -> str:
+    """One skill followed by many continuation lines; quadratic with string +=."""
+    return "Skills:\n• Tooling: Python\n" + "".join(f"and continuation fragment {i}\n" for i in range(lines))
+
+
+def huge_summary(lines: int) -> str:
+    return "".join(f"Summary sentence number {i} describing prior impact.\n" for i in range(lines)) + "Skills:\n• Python\n"
+
+
+def many_sections(sections: int) -> str:
+    return "".join(f"Section {i}:\n• Item {i}\n" for i in range(sections)) + _experience(sections // 10 or 1)
+
+
+CASES = {
+    "realistic": (realistic_resume, 200),
+    "skill_continuations": (skill_continuations, 2000),
+    "huge_summary": (huge_summary, 2000),
+    "many_sections": (many_sections, 2000),
+}
+
+
+def _render(text: str):
+    create_resume_html(text, "Jane Doe", "jane@example.com | 555-0100 | Springfield", "", "", "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    get_template_registry()  # Compile templates outside the timed loops
+
+    print(f"{'case':<22}{'lines':>9}{'parse ms':>11}{'render ms':>11}{'us/line':>10}{'ratio':>8}")
+    for name, (build, size) in CASES.items():
+        base_per_line = None
+        for factor in (1, args.scale):
+            text = build(size * factor)
+            lines = text.count("\n")
+            parse_seconds = time_per_call(lambda: parse_resume(text), args.repeat)
+            render_seconds = time_per_call(lambda: _render(text), args.repeat)
+            per_line = render_seconds / lines * 1e6
+            base_per_line = base_per_line or per_line
+            print(
+                f"{name:<22}{lines:>9}{parse_seconds * 1000:>11.2f}{render_seconds * 1000:>11.2f}"
+                f"{per_line:>10.2f}{per_line / base_per_line:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
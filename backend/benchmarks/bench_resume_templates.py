@@ -0,0 +1,48 @@
+"""Benchmark per-render cost of the resume HTML templates.
+
+For each layout this times a render through the shared precompiled registry,
+and the same render when templates are compiled and stylesheets read on every
+call (what rendering costs without the registry). Context building (resume
+parsing and section shaping) is timed separately.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_resume_templates --jobs 5 --repeat 500
+"""
+import argparse
+
+from app.core.config import RESUME_TEMPLATES_DIR
+from app.services.pdf_service import build_resume_context, create_resume_html
+from app.services.template_registry import RESUME_LAYOUTS, TemplateRegistry, get_template_registry
+
+from .bench_resume_html import realistic_resume
+from .results import time_per_call
+
+CONTACT_INFO = "jane@example.com | 555-0100 | Springfield"
+LINKS = ("https://github.com/jane", "https://linkedin.com/in/jane", "https://jane.dev")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5, help="work experience entries in the sample resume")
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    resume_text = realistic_resume(args.jobs)
+    get_template_registry()  # Compile outside the timed loops, as application startup does
+
+    context_seconds = time_per_call(lambda: build_resume_context(resume_text), args.repeat)
+    print(f"context build: {context_seconds * 1e6:.1f} us")
+    print(f"{'layout':<10}{'precompiled us':>16}{'compile-per-render us':>23}{'html bytes':>12}")
+    for layout in RESUME_LAYOUTS:
+        render = lambda: create_resume_html(resume_text, "Jane Doe", CONTACT_INFO, *LINKS, layout=layout)
+        context = build_resume_context(resume_text)
+        uncached = lambda: TemplateRegistry(RESUME_TEMPLATES_DIR).render(
+            layout, applicant_name="Jane Doe", contact_items=[], resume=context
+        )
+        precompiled_seconds = time_per_call(render, args.repeat)
+        uncached_seconds = time_per_call(uncached, max(1, args.repeat // 10))
+        print(f"{layout:<10}{precompiled_seconds * 1e6:>16.1f}{uncached_seconds * 1e6:>23.1f}{len(render()):>12}")
+
+
+if __name__ == "__main__":
+    main()
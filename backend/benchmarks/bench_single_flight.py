@@ -0,0 +1,86 @@
+"""Measure how many upstream completions a burst of identical analyses costs.
+
+``--requests`` concurrent /analyze/ calls with the same resume and job
+description are sent against the fake OpenAI server, once with single-flight
+coalescing and once without. Requests send X-Cache-Bypass so the second run
+is not served from the first run's cached analysis; within a burst the cache
+could not help anyway, since every request arrives before the first
+completion has been cached.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_single_flight --requests 50 --llm-latency 0.5
+"""
+import os
+
+# Settings are read at import time, so these must be set before the app is imported
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.main import app
+from app.services.llm_client import LLMClient, close_llm_client, set_llm_client
+from app.services.rate_limiter import limiter
+
+from .bench_prompt_compaction import POSTING
+from .bench_resume_html import realistic_resume
+from .fake_upstreams import FakeServer, UpstreamBehavior, create_fake_openai_app
+from .results import latency_summary, save_results
+
+
+async def burst(client: httpx.AsyncClient, requests: int) -> list:
+    payload = {"resume_text": realistic_resume(5), "job_description_text": POSTING}
+
+    async def one():
+        start = time.perf_counter()
+        response = await client.post("/analyze/", json=payload, headers={"X-Cache-Bypass": "true"})
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    return await asyncio.gather(*(one() for _ in range(requests)))
+
+
+async def run(args) -> dict:
+    limiter.enabled = False
+    results = {}
+    async with app.router.lifespan_context(app):
+        for single_flight in (False, True):
+            server = FakeServer(create_fake_openai_app(UpstreamBehavior(latency=args.llm_latency))).start()
+            try:
+                await close_llm_client()
+                set_llm_client(LLMClient(api_key="sk-bench", base_url=f"{server.url}/v1", single_flight=single_flight))
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                    latencies = await burst(client, args.requests)
+                injector = server.app.state.injector
+                results["single_flight" if single_flight else "independent"] = {
+                    "requests": args.requests,
+                    "upstream_calls": injector.requests,
+                    **latency_summary(latencies),
+                }
+            finally:
+                await close_llm_client()
+                server.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"{'mode':<15}{'requests':>10}{'upstream':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode, result in results.items():
+        print(f"{mode:<15}{result['requests']:>10}{result['upstream_calls']:>10}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}")
+    save_results(args.output, "single_flight", {"requests": args.requests, "llm_latency": args.llm_latency}, results)
+
+
+if __name__ == "__main__":
+    main()
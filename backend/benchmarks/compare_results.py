@@ -0,0 +1,76 @@
+"""Compare two benchmark result files and flag regressions.
+
+Only the metrics named by ``--metrics`` are compared; by default the median
+and tail latencies, throughput and error rate, since best-round and single
+round figures are too noisy to gate on. Timings and error rates regress when
+they grow, and throughput (``*_rps``) when it shrinks, by more than
+``--threshold``. Exits with status 1 if any metric regressed, so it can gate CI.
+
+Usage (from the backend directory):
+    python -m benchmarks.compare_results results/base.json results/new.json --threshold 0.1
+"""
+import argparse
+import json
+import sys
+
+DEFAULT_METRICS = ("median_us", "p50_ms", "p95_ms", "p99_ms", "throughput_rps", "error_rate")
+_LOWER_IS_BETTER = ("_ms", "_us", "_s", "error_rate")
+_HIGHER_IS_BETTER = ("_rps",)
+
+
+def _direction(metric: str) -> int:
+    """+1 if larger is worse, -1 if smaller is worse, 0 if the metric is not compared."""
+    if metric.endswith(_LOWER_IS_BETTER):
+        return 1
+    if metric.endswith(_HIGHER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(base: dict, new: dict, threshold: float, metrics=DEFAULT_METRICS):
+    """Yield (case, metric, base value, new value, relative change, regressed)."""
+    for case, new_metrics in new["results"].items():
+        base_metrics = base["results"].get(case)
+        if base_metrics is None:
+            continue
+        for metric, new_value in new_metrics.items():
+            if metric not in metrics:
+                continue
+            direction = _direction(metric)
+            base_value = base_metrics.get(metric)
+            if not direction or not isinstance(new_value, (int, float)) or not isinstance(base_value, (int, float)):
+                continue
+            if base_value == 0:
+                change = 0.0 if new_value == 0 else float("inf")
+            else:
+                change = (new_value - base_value) / base_value
+            yield case, metric, base_value, new_value, change, change * direction > threshold
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change counted as a regression")
+    parser.add_argument("--metrics", nargs="+", default=list(DEFAULT_METRICS))
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    if base["benchmark"] != new["benchmark"]:
+        sys.exit(f"Cannot compare {base['benchmark']!r} results with {new['benchmark']!r} results")
+
+    regressions = 0
+    print(f"{'case':<32}{'metric':<16}{'base':>12}{'new':>12}{'change':>10}")
+    for case, metric, base_value, new_value, change, regressed in compare(base, new, args.threshold, args.metrics):
+        regressions += regressed
+        marker = "  REGRESSION" if regressed else ""
+        print(f"{case:<32}{metric:<16}{base_value:>12.2f}{new_value:>12.2f}{change:>+10.1%}{marker}")
+    print(f"\n{regressions} regression(s) over {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
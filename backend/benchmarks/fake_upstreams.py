@@ -0,0 +1,238 @@
+"""Local stand-ins for the OpenAI chat completions and DocRaptor APIs.
+
+Both servers speak enough of the real HTTP APIs for the pooled clients in
+app.services to use them unchanged, so a load test exercises the real
+connection pools, retries and streaming paths without spending API credit.
+
+- Latency: every response waits ``latency`` seconds (plus up to ``jitter``)
+  before the first byte, and a ``stall_rate`` fraction of them another
+  ``stall_latency`` seconds, for a long tail.
+- Token rate: OpenAI completions then take ``completion_tokens /
+  tokens_per_second`` more. Streamed completions spread their chunks over
+  that time.
+- Failure injection: a ``failure_rate`` fraction of requests get a 500, and
+  a ``throttle_rate`` fraction get a 429 with Retry-After: 1.
+
+Run standalone to point a real server at them:
+    python -m benchmarks.fake_upstreams --port 8100 --latency 0.5
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 DOCRAPTOR_URL=http://127.0.0.1:8100/docs uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from .bench_response_parser import REALISTIC_RESPONSE
+from .bench_resume_html import realistic_resume
+
+IMPROVEMENT_SUMMARY = (
+    "## Improvement Summary\n"
+    "- Reworded the summary around platform engineering\n"
+    "- Quantified the impact of the API migration\n"
+    "- Moved Kubernetes experience into the first role\n"
+    "- Grouped skills by category\n"
+    "- Tightened bullet points to start with action verbs\n"
+)
+
+STRUCTURED_ANALYSIS = json.dumps({
+    "compatibility_score": 72,
+    "improvement_summary": "- Highlight Kubernetes experience\n- Quantify achievements",
+    "matched_keywords": ["Python", "FastAPI"],
+    "missing_keywords": ["Kubernetes"],
+})
+
+
+class UpstreamBehavior(NamedTuple):
+    latency: float = 0.2
+    jitter: float = 0.0
+    tokens_per_second: float = 0.0  # 0 disables token pacing
+    failure_rate: float = 0.0
+    throttle_rate: float = 0.0
+    pdf_bytes: int = 60_000
+    stall_rate: float = 0.0
+    stall_latency: float = 0.0
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class _Injector:
+    """Shared latency and failure decisions for one fake server."""
+
+    def __init__(self, behavior: UpstreamBehavior, seed: Optional[int]):
+        self.behavior = behavior
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.failures = 0
+
+    async def delay(self):
+        delay = self.behavior.latency + self.random.uniform(0, self.behavior.jitter)
+        if self.random.random() < self.behavior.stall_rate:
+            delay += self.behavior.stall_latency
+        await asyncio.sleep(delay)
+
+    def failure(self) -> Optional[Response]:
+        self.requests += 1
+        roll = self.random.random()
+        if roll < self.behavior.failure_rate:
+            self.failures += 1
+            return JSONResponse({"error": {"message": "Injected failure", "type": "server_error"}}, status_code=500)
+        if roll < self.behavior.failure_rate + self.behavior.throttle_rate:
+            self.failures += 1
+            return JSONResponse(
+                {"error": {"message": "Injected rate limit", "type": "rate_limit_error"}},
+                status_code=429,
+                headers={"Retry-After": "1"},
+            )
+        return None
+
+
+def _completion_text(body: dict, counter: int) -> str:
+    """Pick a response shaped like what the calling prompt asks for."""
+    if body.get("response_format"):
+        return STRUCTURED_ANALYSIS
+    system_prompt = body["messages"][0]["content"]
+    if "explain the improvements" in system_prompt:
+        return IMPROVEMENT_SUMMARY
+    if "enhance a candidate's resume" in system_prompt:
+        # A different resume each time, so PDF deduplication does not hide render load
+        return f"Enhanced draft {counter}.\n" + realistic_resume(5)
+    return REALISTIC_RESPONSE
+
+
+def create_fake_openai_app(behavior: UpstreamBehavior, seed: Optional[int] = None) -> Starlette:
+    injector = _Injector(behavior, seed)
+    counter = itertools.count()
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        await injector.delay()
+        failure = injector.failure()
+        if failure is not None:
+            return failure
+
+        text = _completion_text(body, next(counter))
+        prompt_tokens = sum(_estimate_tokens(message["content"]) for message in body["messages"])
+        completion_tokens = _estimate_tokens(text)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+        generation_seconds = completion_tokens / behavior.tokens_per_second if behavior.tokens_per_second else 0.0
+        base = {"id": f"chatcmpl-fake-{time.time_ns()}", "created": int(time.time()), "model": body["model"]}
+
+        if not body.get("stream"):
+            await asyncio.sleep(generation_seconds)
+            return JSONResponse({
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+        pieces = [text[i:i + 40] for i in range(0, len(text), 40)]
+
+        async def events():
+            for piece in pieces:
+                await asyncio.sleep(generation_seconds / len(pieces))
+                chunk = {**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            if include_usage:
+                yield f"data: {json.dumps({**base, 'object': 'chat.completion.chunk', 'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def models(request: Request):
+        return JSONResponse({"object": "list", "data": [{"id": "gpt-4", "object": "model", "created": 0, "owned_by": "fake"}]})
+
+    app = Starlette(routes=[
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+        Route("/v1/models", models, methods=["GET"]),
+    ])
+    app.state.injector = injector
+    return app
+
+
+def create_fake_docraptor_app(behavior: UpstreamBehavior, seed: Optional[int] = None) -> Starlette:
+    injector = _Injector(behavior, seed)
+    padding = b"0" * max(0, behavior.pdf_bytes - 32)
+
+    async def create_doc(request: Request):
+        if request.method == "HEAD":
+            return Response(status_code=200)
+        body = await request.json()
+        await injector.delay()
+        failure = injector.failure()
+        if failure is not None:
+            return failure
+        # A fixed-size body; the content only needs to look like a PDF
+        document = b"%PDF-1.4\n%" + str(len(body.get("document_content", ""))).encode("ascii") + b"\n" + padding + b"\n%%EOF\n"
+        return Response(document, media_type="application/pdf")
+
+    app = Starlette(routes=[Route("/docs", create_doc, methods=["POST", "HEAD"])])
+    app.state.injector = injector
+    return app
+
+
+class FakeServer:
+    """Serve an ASGI app with uvicorn on a background thread and its own event loop."""
+
+    def __init__(self, app, host: str = "127.0.0.1", port: int = 0):
+        self.app = app
+        self._server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="off"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeServer":
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("Fake upstream server failed to start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self):
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--pdf-bytes", type=int, default=60_000)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--stall-latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    behavior = UpstreamBehavior(
+        args.latency, args.jitter, args.tokens_per_second, args.failure_rate, args.throttle_rate, args.pdf_bytes,
+        args.stall_rate, args.stall_latency
+    )
+    openai_app = create_fake_openai_app(behavior)
+    docraptor_app = create_fake_docraptor_app(behavior)
+    # One port for both, so a single process stands in for both providers
+    app = Starlette(routes=list(openai_app.routes) + list(docraptor_app.routes))
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
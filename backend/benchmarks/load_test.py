@@ -0,0 +1,145 @@
+"""Closed-loop load test of /analyze/ and /enhance-resume/ against fake upstreams.
+
+The app runs in process (through its lifespan) with its real OpenAI and
+DocRaptor clients, pointed at the local stand-ins in fake_upstreams. Each of
+``--concurrency`` virtual users sends its next request as soon as the
+previous one returns, until ``--requests`` requests per endpoint are done.
+Analyses send X-Cache-Bypass, and every enhanced resume differs, so caches
+and PDF deduplication do not hide upstream load. The rate limiter is off.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_test --requests 200 --concurrency 20 --llm-latency 0.5 --output results/load.json
+"""
+import os
+
+# Settings are read at import time, so these must be set before the app is imported
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ.setdefault("DOCRAPTOR_API_KEY", "bench")
+os.environ.setdefault("PDF_RENDER_BACKEND", "docraptor")
+# Injected upstream failures would otherwise log a traceback each
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+
+from app.main import app
+from app.services.docraptor_client import DocRaptorClient, close_docraptor_client, set_docraptor_client
+from app.services.llm_client import LLMClient, close_llm_client, set_llm_client
+from app.services.rate_limiter import limiter
+
+from .bench_resume_html import realistic_resume
+from .bench_prompt_compaction import POSTING
+from .fake_upstreams import FakeServer, UpstreamBehavior, create_fake_docraptor_app, create_fake_openai_app
+from .results import latency_summary, save_results
+
+ENDPOINTS = ("analyze", "enhance")
+
+
+def _request(endpoint: str, index: int):
+    """(path, JSON body, headers) for the index-th request to an endpoint."""
+    resume_text = realistic_resume(5)
+    if endpoint == "analyze":
+        body = {"resume_text": resume_text, "job_description_text": POSTING}
+        return "/analyze/", body, {"X-Cache-Bypass": "true"}
+    body = {
+        "resume_text": resume_text,
+        "job_description_text": POSTING,
+        "applicant_name": f"Load Test {index}",
+        "contact_info": "load@example.com | 555-0100 | Springfield",
+    }
+    return "/enhance-resume/", body, {}
+
+
+async def run_endpoint(client: httpx.AsyncClient, endpoint: str, total: int, concurrency: int) -> dict:
+    indexes = iter(range(total))
+    latencies = []
+    statuses: Counter = Counter()
+
+    async def virtual_user():
+        for index in indexes:
+            path, body, headers = _request(endpoint, index)
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=body, headers=headers)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    succeeded = statuses.get("200", 0)
+    return {
+        "requests": total,
+        "succeeded": succeeded,
+        "error_rate": round(1 - succeeded / total, 4) if total else 0.0,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(succeeded / elapsed, 3) if elapsed else 0.0,
+        **latency_summary(latencies),
+        "statuses": dict(statuses),
+    }
+
+
+async def run(args) -> dict:
+    llm_behavior = UpstreamBehavior(args.llm_latency, args.jitter, args.tokens_per_second, args.failure_rate, args.throttle_rate)
+    pdf_behavior = UpstreamBehavior(args.pdf_latency, args.jitter, 0.0, args.failure_rate, args.throttle_rate, args.pdf_bytes)
+    openai_server = FakeServer(create_fake_openai_app(llm_behavior, args.seed)).start()
+    docraptor_server = FakeServer(create_fake_docraptor_app(pdf_behavior, args.seed)).start()
+    limiter.enabled = False
+
+    results = {}
+    try:
+        async with app.router.lifespan_context(app):
+            # Replace whatever the lifespan built with clients aimed at the stand-ins
+            await close_llm_client()
+            await close_docraptor_client()
+            set_llm_client(LLMClient(api_key="sk-bench", base_url=f"{openai_server.url}/v1"))
+            set_docraptor_client(DocRaptorClient(api_key="bench", url=f"{docraptor_server.url}/docs"))
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+                for endpoint in args.endpoints:
+                    results[endpoint] = await run_endpoint(client, endpoint, args.requests, args.concurrency)
+            await close_llm_client()
+            await close_docraptor_client()
+    finally:
+        openai_server.stop()
+        docraptor_server.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=100, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds before each fake completion starts")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="fake completion token rate; 0 returns at once")
+    parser.add_argument("--pdf-latency", type=float, default=0.3)
+    parser.add_argument("--pdf-bytes", type=int, default=60_000)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of upstream calls answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of upstream calls answered with 429")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"{'endpoint':<10}{'ok/total':>10}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  statuses")
+    for endpoint, result in results.items():
+        print(
+            f"{endpoint:<10}{result['succeeded']:>5}/{result['requests']:<4}{result['throughput_rps']:>9.2f}"
+            f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}  {result['statuses']}"
+        )
+    save_results(args.output, "load_test", {key: value for key, value in vars(args).items() if key != "output"}, results)
+
+
+if __name__ == "__main__":
+    main()
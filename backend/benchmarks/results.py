@@ -0,0 +1,102 @@
+"""Shared helpers for timing benchmark cases, statistics and JSON result files.
+
+Result files have the shape ``{"benchmark", "params", "environment", "results"}``,
+where ``results`` maps a case name to a flat dict of numbers. compare_results
+diffs two such files.
+"""
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (pct in 0-100); NaN for no values."""
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def time_per_call(func: Callable[[], object], calls: int) -> float:
+    """Mean seconds per call over ``calls`` back-to-back calls of ``func``."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+
+def measure(func: Callable[[], object], calls: int, rounds: int) -> Dict[str, float]:
+    """Median, best and p95 per-call time over ``rounds`` rounds of ``calls`` calls, in microseconds."""
+    func()  # Warm caches and lazily built state outside the timed rounds
+    per_call = [time_per_call(func, calls) for _ in range(rounds)]
+    return {
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+        "min_us": round(min(per_call) * 1e6, 3),
+        "p95_us": round(percentile(per_call, 95) * 1e6, 3),
+        "calls_per_round": calls,
+    }
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """p50/p95/p99, mean and max of latencies in seconds, reported in milliseconds."""
+    if not latencies:
+        return {"p50_ms": math.nan, "p95_ms": math.nan, "p99_ms": math.nan, "mean_ms": math.nan, "max_ms": math.nan}
+    return {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(path: Optional[str], benchmark: str, params: dict, results: Dict[str, dict]):
+    """Write a result file to ``path`` (nothing is written when it is None)."""
+    if not path:
+        return
+    document = {
+        "benchmark": benchmark,
+        "params": params,
+        "environment": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        # NaN is not valid JSON; cases without samples are written as null
+        json.dump(_without_nan(document), f, indent=2)
+        f.write("\n")
+    print(f"Results written to {path}")
+
+
+def _without_nan(value):
+    if isinstance(value, dict):
+        return {key: _without_nan(item) for key, item in value.items()}
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
@@ -0,0 +1,44 @@
+from app.utils.response_parser import parse_ai_response
+
+
+def test_parses_sections_in_prompt_order():
+    result = parse_ai_response(
+        "Score: 72%\n"
+        "Summary:\n- Quantify achievements\n"
+        "Matched Keywords:\n- Python\n- FastAPI\n"
+        "Missing Keywords:\n- Kubernetes\n"
+    )
+    assert result["compatibility_score"] == 72.0
+    assert result["improvement_summary"] == "- Quantify achievements"
+    assert result["matched_keywords"] == ["Python", "FastAPI"]
+    assert result["missing_keywords"] == ["Kubernetes"]
+
+
+def test_missing_summary_keeps_keywords():
+    result = parse_ai_response(
+        "Score: 64%\n"
+        "Matched Keywords:\n- Python\n"
+        "Missing Keywords:\n- Kubernetes\n- Terraform\n"
+    )
+    assert result["compatibility_score"] == 64.0
+    assert result["improvement_summary"] == "Could not parse improvement suggestions from AI response."
+    assert result["matched_keywords"] == ["Python"]
+    assert result["missing_keywords"] == ["Kubernetes", "Terraform"]
+
+
+def test_reordered_sections():
+    result = parse_ai_response(
+        "Score: 80%\n"
+        "Missing Keywords:\n- Kubernetes\n"
+        "Summary:\n- Lead with impact\n"
+        "Matched Keywords:\n- Python\n"
+    )
+    assert result["improvement_summary"] == "- Lead with impact"
+    assert result["matched_keywords"] == ["Python"]
+    assert result["missing_keywords"] == ["Kubernetes"]
+
+
+def test_marker_text_on_the_same_line():
+    result = parse_ai_response("Score: 50% Summary: Tighten the intro Matched Keywords:\n- Go\n")
+    assert result["improvement_summary"] == "Tighten the intro"
+    assert result["matched_keywords"] == ["Go"]